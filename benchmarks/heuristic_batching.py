@@ -0,0 +1,64 @@
+"""Measures how batching heuristic evaluations affects A* on the sliding tile puzzle.
+
+Each seeded instance is solved by `AStarSearch` with the Manhattan distance heuristic, evaluated in several ways:
+
+    plain: one call to the heuristic per successor
+    incremental: the heuristic of each successor is updated from that of its parent
+    batch: one NumPy call per expansion, for all of the successors of the expanded node
+    batch-N: one NumPy call per N expansions, which may expand a few nodes that A* would not have
+
+The benchmark checks that every way finds a solution of the same cost, and reports the nodes generated, the wall time
+and the speedup over plain evaluation. Batching pays off when the heuristic is expensive relative to the overhead of
+calling it, so the gains grow with the size of the board:
+
+    python benchmarks/heuristic_batching.py --size 4 --batch-sizes 16 64 256
+
+NumPy must be installed (`pip install cannibals[vectorized]`).
+
+Author: Ryan Strauss
+"""
+
+import argparse
+import random
+import time
+
+from cannibals.problems.sliding_tile.heuristics import make_heuristic_fn, manhattan_distance
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+from cannibals.search.informed_search import AStarSearch
+from search_benchmarks import random_instance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--size', type=int, default=4, help='width of the board')
+    parser.add_argument('--seed', type=int, default=0, help='seed for generating the instances')
+    parser.add_argument('--count', type=int, default=5, help='number of instances')
+    parser.add_argument('--walk-length', type=int, default=60, help='length of the random walk that makes an instance')
+    parser.add_argument('--batch-sizes', type=int, nargs='*', default=[16, 64, 256],
+                        help='numbers of expansions to evaluate together')
+    args = parser.parse_args()
+
+    methods = [('plain', {}, 1), ('incremental', {'incremental': True}, 1), ('batch', {'batch': True}, 1)]
+    methods += [(f'batch-{n}', {'batch': True}, n) for n in args.batch_sizes]
+    rng = random.Random(args.seed)
+
+    print(f'{"instance":>8} {"method":<12}{"cost":>6}{"nodes":>12}{"seconds":>10}{"speedup":>9}')
+    for instance in range(args.count):
+        problem = SlidingTilePuzzle(random_instance(args.size, rng, args.walk_length))
+        baseline = cost = None
+        for name, options, expansion_batch_size in methods:
+            heuristic_fn = make_heuristic_fn(problem, manhattan_distance, **options)
+            start = time.perf_counter()
+            result = AStarSearch.search(problem, heuristic_fn, expansion_batch_size=expansion_batch_size)
+            seconds = time.perf_counter() - start
+            cost = cost or result.solution_cost
+            if result.solution_cost != cost:
+                raise AssertionError(f'{name} found a solution of cost {result.solution_cost} on instance {instance}, '
+                                     f'but the optimal cost is {cost}')
+            baseline = baseline or seconds
+            print(f'{instance:>8} {name:<12}{result.solution_cost:>6.0f}{result.nodes_generated:>12}{seconds:>10.2f}'
+                  f'{baseline / seconds:>8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
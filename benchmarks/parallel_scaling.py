@@ -0,0 +1,95 @@
+"""Measures how `HashDistributedAStarSearch` scales with the number of worker processes.
+
+Each seeded 15-puzzle instance is solved by `AStarSearch` and then by `HashDistributedAStarSearch` with every number
+of workers, using the Manhattan distance heuristic. The benchmark checks that every run finds a solution of the same
+cost, and reports the wall time, the number of nodes generated and the speedup over a single worker and over
+`AStarSearch`:
+
+    python benchmarks/parallel_scaling.py --workers 1 2 4 8 16 --output scaling.json
+
+The speedup can only be as large as the number of processors on the machine.
+
+Author: Ryan Strauss
+"""
+
+import argparse
+import functools
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+
+from cannibals.problems.sliding_tile.heuristics import make_heuristic_fn, manhattan_distance
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+from cannibals.search.informed_search import AStarSearch
+from cannibals.search.parallel import HashDistributedAStarSearch
+from search_benchmarks import random_instance
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--seed', type=int, default=0, help='seed for generating the instances')
+    parser.add_argument('--count', type=int, default=3, help='number of instances')
+    parser.add_argument('--walk-length', type=int, default=60, help='length of the random walk that makes an instance')
+    parser.add_argument('--workers', type=int, nargs='*', default=[1, 2, 4, 8, 16], help='numbers of workers to run')
+    parser.add_argument('--output', help='file to write the JSON results to')
+    args = parser.parse_args()
+
+    heuristic_factory = functools.partial(make_heuristic_fn, heuristic_fn=manhattan_distance, incremental=True)
+    rng = random.Random(args.seed)
+    results = []
+
+    print(f'{"instance":>8}{"workers":>8}{"cost":>6}{"nodes":>12}{"seconds":>10}{"vs 1":>8}{"vs A*":>8}',
+          file=sys.stderr)
+    for instance in range(args.count):
+        tiles = random_instance(4, rng, args.walk_length)
+        problem = SlidingTilePuzzle(tiles)
+        serial, serial_time = timed(AStarSearch.search, problem, heuristic_factory(problem))
+        single_time = None
+
+        for num_workers in args.workers:
+            result, wall_time = timed(HashDistributedAStarSearch.search, problem, heuristic_factory=heuristic_factory,
+                                      num_workers=num_workers)
+            if result.solution_cost != serial.solution_cost:
+                raise AssertionError(f'{num_workers} workers found a solution of cost {result.solution_cost} on '
+                                     f'instance {instance}, but the optimal cost is {serial.solution_cost}')
+            single_time = single_time or wall_time
+            results.append({
+                'instance': instance,
+                'tiles': tiles,
+                'workers': num_workers,
+                'solution_cost': result.solution_cost,
+                'nodes_generated': result.nodes_generated,
+                'wall_time': wall_time,
+                'astar_nodes_generated': serial.nodes_generated,
+                'astar_wall_time': serial_time,
+            })
+            print(f'{instance:>8}{num_workers:>8}{result.solution_cost:>6.0f}{result.nodes_generated:>12}'
+                  f'{wall_time:>10.2f}{single_time / wall_time:>7.2f}x{serial_time / wall_time:>7.2f}x',
+                  file=sys.stderr)
+
+    if args.output:
+        report = {
+            'metadata': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': multiprocessing.cpu_count(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'seed': args.seed,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+
+
+if __name__ == '__main__':
+    main()
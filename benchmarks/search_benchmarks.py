@@ -0,0 +1,228 @@
+"""Benchmarks the search strategies in `cannibals.search` on random instances of the sliding tile puzzle.
+
+Every strategy is run on a set of seeded, solvable 8-puzzle and 15-puzzle instances, sorted by the length of their
+optimal solutions. Strategies that take a heuristic are given the Manhattan distance; strategies that do not are only
+run on the 8-puzzle. Each run happens in a fresh process, so that its peak memory usage can be measured in isolation.
+
+For each run, the benchmark reports the throughput in nodes per second, the peak frontier size, the peak resident set
+size, the peak memory allocated according to `tracemalloc`, and (using `cProfile`) how much time was spent generating
+successors, evaluating the heuristic and operating on the frontier. The results are written as JSON, and can be
+compared against the results of an earlier run:
+
+    python benchmarks/search_benchmarks.py --output baseline.json
+    python benchmarks/search_benchmarks.py --output current.json --baseline baseline.json
+
+Author: Ryan Strauss
+"""
+
+import argparse
+import cProfile
+import inspect
+import json
+import multiprocessing
+import platform
+import pstats
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import cannibals.search
+from cannibals.problems.sliding_tile.heuristics import make_heuristic_fn, manhattan_distance, linear_conflict
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+from cannibals.search.base import SearchStrategy
+from cannibals.search.informed_search import IterativeDeepeningAStarSearch
+
+# Source files whose functions count towards each phase of the search when profiling
+PHASE_FILES = {
+    'expand': ('search/base.py', 'sliding_tile/puzzle.py', 'sliding_tile/board.py'),
+    'heuristic': ('sliding_tile/heuristics.py', 'sliding_tile/pattern_database.py'),
+    'frontier': ('search/frontiers.py',),
+}
+
+
+def goal_tiles(size):
+    return list(range(1, size * size)) + [0]
+
+
+def random_instance(size, rng, walk_length=None):
+    """Generates a random solvable board.
+
+    If `walk_length` is None, the board is a uniformly random solvable permutation. Otherwise, it is the result of a
+    random walk of that many moves from the goal, which keeps instances of the larger puzzles tractable.
+    """
+    if walk_length is None:
+        while True:
+            tiles = goal_tiles(size)
+            rng.shuffle(tiles)
+            if SlidingTilePuzzle(tiles).is_solvable():
+                return tiles
+
+    problem = SlidingTilePuzzle(goal_tiles(size))
+    state, previous = problem.initial_state, None
+    for _ in range(walk_length):
+        actions = [a for a in problem.get_actions(state) if a != SlidingTilePuzzle.INVERSE_ACTIONS.get(previous)]
+        previous = rng.choice(actions)
+        state, _ = problem.transition(state, previous)
+    return list(state.tiles)
+
+
+def make_instances(seed, count):
+    """Generates the benchmark instances, sorted by puzzle and then by the length of their optimal solutions."""
+    rng = random.Random(seed)
+    instances = []
+    for puzzle, size, walk_length in (('8-puzzle', 3, None), ('15-puzzle', 4, 40)):
+        for i in range(count):
+            tiles = random_instance(size, rng, walk_length)
+            problem = SlidingTilePuzzle(tiles)
+            solution, _ = IterativeDeepeningAStarSearch.search(
+                problem, make_heuristic_fn(problem, linear_conflict, incremental=True))
+            instances.append({'puzzle': puzzle, 'tiles': tiles, 'depth': len(solution)})
+    instances.sort(key=lambda instance: (instance['puzzle'], instance['depth']))
+    return instances
+
+
+def strategies():
+    """Finds every search strategy exported by `cannibals.search`."""
+    # Some strategies are only imported when they are first accessed, so they are looked up by name
+    members = {name: getattr(cannibals.search, name) for name in dir(cannibals.search) if not name.startswith('_')}
+    return {name: value for name, value in members.items()
+            if inspect.isclass(value) and issubclass(value, SearchStrategy) and value is not SearchStrategy}
+
+
+def search_kwargs(strategy, problem):
+    """Builds the keyword arguments for a strategy, giving it the Manhattan distance heuristic if it takes one."""
+    parameters = inspect.signature(strategy.search).parameters
+    kwargs = {}
+    if 'heuristic_fn' in parameters:
+        kwargs['heuristic_fn'] = make_heuristic_fn(problem, manhattan_distance, incremental=True)
+    if 'reverse_heuristic_fn' in parameters:
+        reverse_problem = SlidingTilePuzzle(problem.goal_state, problem.initial_state)
+        kwargs['reverse_heuristic_fn'] = make_heuristic_fn(reverse_problem, manhattan_distance, incremental=True)
+    return kwargs
+
+
+def phase_times(profile):
+    """Sums the time spent in each phase of the search from a profile."""
+    times = dict.fromkeys(PHASE_FILES, 0.0)
+    times['other'] = 0.0
+    for (filename, _, _), (_, _, total_time, _, _) in pstats.Stats(profile).stats.items():
+        filename = filename.replace('\\', '/')
+        phase = next((phase for phase, files in PHASE_FILES.items() if filename.endswith(files)), 'other')
+        times[phase] += total_time
+    return times
+
+
+def run_single(strategy_name, tiles, repeat, profile):
+    """Benchmarks one strategy on one instance. This is run in a separate process."""
+    strategy = strategies()[strategy_name]
+    problem = SlidingTilePuzzle(tiles)
+
+    # The fastest of the timed runs is kept, since it is the least affected by noise from the rest of the system
+    wall_time = float('inf')
+    for _ in range(repeat):
+        kwargs = search_kwargs(strategy, problem)
+        start = time.perf_counter()
+        result = strategy.search(problem, **kwargs)
+        wall_time = min(wall_time, time.perf_counter() - start)
+    solution, nodes_generated = result[0], result[1]
+
+    # The peak RSS is read before tracing and profiling are turned on, since both use a lot of memory themselves.
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak_rss //= 1024
+
+    kwargs = search_kwargs(strategy, problem)
+    tracemalloc.start()
+    strategy.search(problem, **kwargs)
+    _, tracemalloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    phases = None
+    if profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(strategy.search, problem, **search_kwargs(strategy, problem))
+        phases = phase_times(profiler)
+
+    return {
+        'solution_length': None if solution is None else len(solution),
+        'nodes_generated': nodes_generated,
+        'wall_time': wall_time,
+        'nodes_per_second': nodes_generated / wall_time if wall_time > 0 else None,
+        # Only strategies that return a `SearchResult` report the size of their frontier
+        'peak_frontier_size': getattr(result, 'max_frontier_size', None),
+        'peak_rss_kb': peak_rss,
+        'tracemalloc_peak_bytes': tracemalloc_peak,
+        'phase_seconds': phases,
+    }
+
+
+def compare(results, baseline):
+    """Prints how the throughput of each run changed relative to a baseline run."""
+    previous = {(r['strategy'], r['puzzle'], tuple(r['tiles'])): r for r in baseline['results']}
+    print(f'{"strategy":<36}{"puzzle":<12}{"depth":>6}{"nodes/s":>14}{"baseline":>14}{"change":>9}', file=sys.stderr)
+    for result in results:
+        old = previous.get((result['strategy'], result['puzzle'], tuple(result['tiles'])))
+        if old is None or not old['nodes_per_second'] or not result['nodes_per_second']:
+            continue
+        change = result['nodes_per_second'] / old['nodes_per_second'] - 1
+        print(f'{result["strategy"]:<36}{result["puzzle"]:<12}{result["depth"]:>6}'
+              f'{result["nodes_per_second"]:>14.0f}{old["nodes_per_second"]:>14.0f}{change:>+9.1%}', file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--seed', type=int, default=0, help='seed for generating the instances')
+    parser.add_argument('--count', type=int, default=5, help='number of instances of each puzzle')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs of each benchmark')
+    parser.add_argument('--strategies', nargs='*', help='names of the strategies to run (default: all)')
+    parser.add_argument('--no-profile', action='store_true', help='skip the profiled run that measures phase times')
+    parser.add_argument('--output', help='file to write the JSON results to (default: stdout)')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    names = args.strategies or sorted(strategies())
+    instances = make_instances(args.seed, args.count)
+    context = multiprocessing.get_context('spawn')
+
+    results = []
+    for name in names:
+        takes_heuristic = 'heuristic_fn' in inspect.signature(strategies()[name].search).parameters
+        for instance in instances:
+            if instance['puzzle'] != '8-puzzle' and not takes_heuristic:
+                continue
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                future = executor.submit(run_single, name, instance['tiles'], args.repeat, not args.no_profile)
+                measurements = future.result()
+            results.append({'strategy': name, **instance, **measurements})
+            print(f'{name} on {instance["puzzle"]} (depth {instance["depth"]}): '
+                  f'{measurements["nodes_per_second"] or 0:.0f} nodes/s', file=sys.stderr)
+
+    report = {
+        'metadata': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seed': args.seed,
+            'count': args.count,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(report, fp, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)
+        compare(results, baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Measures how quickly successors of the sliding tile puzzle are generated.
+
+Four ways of generating successors are compared on the states along a random walk:
+
+    baseline: a copy of how successors were generated before the move table, which copied the list of every action,
+        removed the illegal ones, and checked the bounds of the board again for each move
+    generic: `get_actions` followed by `transition` for each action, which is what `AbstractProblem.successors` does
+    table: `SlidingTilePuzzle.successors` without a parent action, which looks up the moves of the blank in a table
+    table+pruning: `SlidingTilePuzzle.successors` with the parent action, which also skips the move that undoes it
+
+For each, the number of states expanded per second, the number of successors generated per second and the speedup over
+the baseline are reported.
+Pruning generates fewer successors per state, so its benefit shows up in the states expanded per second and in the
+smaller number of nodes that a search has to store:
+
+    python benchmarks/successors.py --sizes 3 4 5
+
+Author: Ryan Strauss
+"""
+
+import argparse
+import random
+import timeit
+
+from cannibals.problems.base import AbstractProblem
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+
+
+def random_walk(problem, length, rng):
+    """Returns the `(state, action)` pairs along a random walk, where `action` is the action that reached `state`."""
+    state, action = problem.initial_state, None
+    walk = []
+    for _ in range(length):
+        walk.append((state, action))
+        action = rng.choice(problem.get_actions(state))
+        state, _ = problem.transition(state, action)
+    return walk
+
+
+def _baseline_actions(state):
+    row, col = state.blank_pos
+    actions = list(SlidingTilePuzzle.VALID_ACTIONS)
+    if row == 0:
+        actions.remove('U')
+    if row == state.board_size - 1:
+        actions.remove('D')
+    if col == 0:
+        actions.remove('L')
+    if col == state.board_size - 1:
+        actions.remove('R')
+    return actions
+
+
+def _baseline_move(state, action):
+    row, col = divmod(state.blank_index, state.board_size)
+    if action == 'U' and row > 0:
+        swap_index = state.blank_index - state.board_size
+    elif action == 'D' and row < state.board_size - 1:
+        swap_index = state.blank_index + state.board_size
+    elif action == 'L' and col > 0:
+        swap_index = state.blank_index - 1
+    elif action == 'R' and col < state.board_size - 1:
+        swap_index = state.blank_index + 1
+    else:
+        raise ValueError(f'{action} is not a valid action')
+    return state.swap_blank(swap_index)
+
+
+def baseline(problem, walk):
+    return sum(len([(action, _baseline_move(state, action), 1.0) for action in _baseline_actions(state)])
+               for state, _ in walk)
+
+
+def generic(problem, walk):
+    return sum(len(AbstractProblem.successors(problem, state)) for state, _ in walk)
+
+
+def table(problem, walk):
+    return sum(len(problem.successors(state)) for state, _ in walk)
+
+
+def table_with_pruning(problem, walk):
+    return sum(len(problem.successors(state, action)) for state, action in walk)
+
+
+METHODS = (('baseline', baseline), ('generic', generic), ('table', table), ('table+pruning', table_with_pruning))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='*', default=[3, 4, 5], help='board sizes to measure')
+    parser.add_argument('--states', type=int, default=10000, help='number of states to generate successors for')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed runs, of which the fastest is kept')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the random walk')
+    args = parser.parse_args()
+
+    print(f'{"size":>4} {"method":<16}{"states/s":>12}{"successors/s":>14}{"speedup":>9}')
+    for size in args.sizes:
+        problem = SlidingTilePuzzle(list(range(1, size * size)) + [0])
+        walk = random_walk(problem, args.states, random.Random(args.seed))
+        baseline_rate = None
+        for name, fn in METHODS:
+            count = fn(problem, walk)
+            seconds = min(timeit.repeat(lambda: fn(problem, walk), number=1, repeat=args.repeat))
+            rate = len(walk) / seconds
+            baseline_rate = baseline_rate or rate
+            print(f'{size:>4} {name:<16}{rate:>12.0f}{count / seconds:>14.0f}{rate / baseline_rate:>8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
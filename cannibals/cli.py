@@ -0,0 +1,180 @@
+"""Provides the `cannibals` command, which solves instances of the sliding tile puzzle from a file or standard input.
+
+Each line of the input holds one instance: the initial board, optionally followed by the goal board, separated by
+whitespace. Boards are written in either of the forms that `Board` accepts, such as `635841027` or
+`6,3,5,8,4,1,0,2,7`. Blank lines and lines that start with `#` are skipped. A JSON object is written to standard
+output for each instance as soon as it has been solved, or with a status of `error` if it could not be read or the
+strategy failed on it:
+
+    echo 635841027 865317024 | cannibals --strategy astar --heuristic manhattan --timeout 10
+
+Author: Ryan Strauss
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import sys
+import time
+
+import cannibals.search
+from cannibals.problems.sliding_tile.board import Board
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+from cannibals.search.batch import _BudgetedProblem, _BudgetExceeded
+
+# The names that strategies are selected by, mapped to the names of their classes in `cannibals.search`
+STRATEGIES = {
+    'astar': 'AStarSearch',
+    'anytime-weighted-astar': 'AnytimeWeightedAStarSearch',
+    'bfs': 'BreadthFirstSearch',
+    'bidirectional-astar': 'BidirectionalAStarSearch',
+    'bidirectional-bfs': 'BidirectionalBreadthFirstSearch',
+    'dfs': 'DepthFirstSearch',
+    'external-bfs': 'ExternalBreadthFirstSearch',
+    'focal': 'FocalSearch',
+    'greedy': 'GreedyBestFirstSearch',
+    'idastar': 'IterativeDeepeningAStarSearch',
+    'ids': 'IterativeDeepeningSearch',
+    'ucs': 'UniformCostSearch',
+    'vectorized-bfs': 'VectorizedBreadthFirstSearch',
+    'weighted-astar': 'WeightedAStarSearch',
+}
+
+# The names that heuristics are selected by, mapped to the name of their function in
+# `cannibals.problems.sliding_tile.heuristics` and whether it supports incremental evaluation
+HEURISTICS = {
+    'misplaced-tiles': ('misplaced_tiles', False),
+    'manhattan': ('manhattan_distance', True),
+    'linear-conflict': ('linear_conflict', True),
+}
+
+
+def _heuristic_factory(name, pdb_path):
+    """Returns a function that makes the named heuristic function for a problem, or None if no heuristic is used.
+
+    The heuristics and pattern databases are only imported here, so that they cost nothing when they are not used.
+    """
+    if name == 'none':
+        return None
+    from cannibals.problems.sliding_tile.heuristics import make_heuristic_fn
+    if name == 'pdb':
+        from cannibals.problems.sliding_tile.pattern_database import PatternDatabase
+        return functools.partial(make_heuristic_fn, heuristic_fn=PatternDatabase.load(pdb_path))
+    from cannibals.problems.sliding_tile import heuristics
+    function_name, incremental = HEURISTICS[name]
+    return functools.partial(make_heuristic_fn, heuristic_fn=getattr(heuristics, function_name),
+                             incremental=incremental)
+
+
+def _parse_instance(line):
+    """Parses a line of input into a `SlidingTilePuzzle`."""
+    boards = line.split()
+    if len(boards) > 2:
+        raise ValueError('expected an initial board and an optional goal board')
+    boards = [Board([int(t) for t in board.split(',')] if ',' in board else board) for board in boards]
+    if len(boards) == 2 and boards[0].board_size != boards[1].board_size:
+        raise ValueError(f'the initial board is {boards[0].board_size}x{boards[0].board_size} but the goal board is '
+                         f'{boards[1].board_size}x{boards[1].board_size}')
+    return SlidingTilePuzzle(*boards)
+
+
+def _solve(strategy, problem, heuristic_factory, search_kwargs, timeout, max_nodes):
+    """Solves a single problem within the given budget, returning a dictionary that describes the result."""
+    parameters = inspect.signature(strategy.search).parameters
+    kwargs = dict(search_kwargs)
+    if heuristic_factory is not None:
+        kwargs['heuristic_fn'] = heuristic_factory(problem)
+        if 'reverse_heuristic_fn' in parameters:
+            kwargs['reverse_heuristic_fn'] = heuristic_factory(SlidingTilePuzzle(problem.goal_state,
+                                                                                 problem.initial_state))
+
+    start = time.perf_counter()
+    budgeted = _BudgetedProblem(problem, max_nodes, timeout)
+    try:
+        result = strategy.search(budgeted, **kwargs)
+        solution, nodes_generated = result[0], result[1]
+        status = getattr(result, 'status', None) or ('unsolvable' if solution is None else 'solved')
+    except _BudgetExceeded as e:
+        solution, nodes_generated, status = None, budgeted.nodes_generated, e.status
+
+    return {
+        'status': status,
+        'solution': None if solution is None else ''.join(solution),
+        'length': None if solution is None else len(solution),
+        'nodes_generated': nodes_generated,
+        'wall_time': time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    """Runs the `cannibals` command.
+
+    Args:
+        argv: The command-line arguments, not including the program name. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        The exit status, which is 1 if any instance could not be read or solved and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog='cannibals', description=__doc__.split('\n')[0])
+    parser.add_argument('input', nargs='?', type=argparse.FileType('r'), default=sys.stdin,
+                        help='file with one instance per line (default: standard input)')
+    parser.add_argument('-s', '--strategy', choices=sorted(STRATEGIES), default='astar',
+                        help='search strategy to use (default: astar)')
+    parser.add_argument('-H', '--heuristic', choices=sorted(HEURISTICS) + ['none', 'pdb'],
+                        help='heuristic to use (default: manhattan for strategies that take a heuristic)')
+    parser.add_argument('--pdb', metavar='PATH', help='pattern database file to use with --heuristic pdb')
+    parser.add_argument('--weight', type=float, help='weight for the weighted and focal strategies')
+    parser.add_argument('--timeout', type=float, help='maximum number of seconds to spend on each instance')
+    parser.add_argument('--max-nodes', type=int, help='maximum number of nodes to generate for each instance')
+    args = parser.parse_args(argv)
+
+    strategy = getattr(cannibals.search, STRATEGIES[args.strategy])
+    parameters = inspect.signature(strategy.search).parameters
+    takes_heuristic = 'heuristic_fn' in parameters
+    requires_heuristic = takes_heuristic and parameters['heuristic_fn'].default is inspect.Parameter.empty
+    heuristic = args.heuristic
+    if heuristic is None:
+        heuristic = 'manhattan' if takes_heuristic else 'none'
+    elif heuristic != 'none' and not takes_heuristic:
+        parser.error(f'{args.strategy} does not use a heuristic')
+    elif heuristic == 'none' and requires_heuristic:
+        parser.error(f'{args.strategy} requires a heuristic')
+    if (heuristic == 'pdb') != (args.pdb is not None):
+        parser.error('--pdb must be given exactly when --heuristic is pdb')
+    search_kwargs = {}
+    if args.weight is not None:
+        if 'weight' not in parameters:
+            parser.error(f'{args.strategy} does not take a weight')
+        search_kwargs['weight'] = args.weight
+    heuristic_factory = _heuristic_factory(heuristic, args.pdb)
+
+    exit_status = 0
+    index = 0
+    for line in args.input:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        record = {'index': index, 'instance': line}
+        index += 1
+        try:
+            problem = _parse_instance(line)
+        except ValueError as e:
+            record.update(status='error', error=str(e))
+            exit_status = 1
+        else:
+            try:
+                record.update(_solve(strategy, problem, heuristic_factory, search_kwargs, args.timeout,
+                                     args.max_nodes))
+            except Exception as e:
+                # A strategy that cannot handle one instance, or whose optional dependencies are missing, should not
+                # lose the results of the instances after it
+                record.update(status='error', error=f'{type(e).__name__}: {e}')
+                exit_status = 1
+        print(json.dumps(record), flush=True)
+
+    return exit_status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
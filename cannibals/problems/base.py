@@ -19,8 +19,29 @@ class AbstractProblem(ABC):
     States can take any form for a particular problem, so long as their `__hash__` and `__eq__` methods are
     implemented to reflect that logically equivalent states are determined to be equal and are mapped to the same
     location in a hash table.
+
+    Problems that have a single, explicit goal state and whose actions can be inverted can additionally set
+    `goal_state` and implement `get_reverse_actions` and `reverse_transition`, which allows them to be solved by
+    strategies that search backwards from the goal.
+
+    Problems with a finite state space can also implement `state_space_size`, `rank` and `unrank`, which map each state
+    onto a distinct integer, so that strategies can store states compactly. Problems whose states can be encoded as
+    integers can implement `encode` and `decode`, and strategies then key their explored sets and frontiers by the
+    codes, which are much cheaper to hash and compare than most states. If the codes fit in 64 bits, problems can also
+    implement `batch_successors` and set `batch_actions`, which allows them to be solved by strategies that generate
+    successors for whole arrays of states at once. Problems can also implement `canonical_key`, which lets solutions be
+    cached and shared between problems that are equivalent, and `is_solvable`, which lets strategies reject problems
+    whose goal cannot be reached before searching. Problems whose states can be written as fixed-width bytes can
+    implement `serialized_size`, `serialize` and `deserialize`, which allows them to be searched by strategies that keep
+    states on disk.
     """
 
+    #: The single goal state of the problem, for problems that have one. None if the problem does not declare one.
+    goal_state = None
+
+    #: The actions that are referred to by index in the results of `batch_successors`, for problems that implement it.
+    batch_actions = None
+
     def __init__(self, initial_state):
         """Constructs a new `AbstractProblem`.
 
@@ -73,3 +94,187 @@ class AbstractProblem(ABC):
             is the cost associated with doing that transition.
         """
         pass
+
+    def successors(self, state, parent_action=None):
+        """Generates the successors of a state, which is how strategies expand nodes.
+
+        The default implementation takes every action from `get_actions` through `transition`. Problems can override
+        it to generate successors more quickly, and to skip actions that undo `parent_action`, since those only lead
+        back to the state that `state` was reached from.
+
+        Args:
+            state: The state whose successors are to be generated.
+            parent_action: The action with which `state` was reached, or None if it is the initial state.
+
+        Returns:
+            A list of `(action, next_state, step_cost)` tuples.
+        """
+        successors = []
+        for action in self.get_actions(state):
+            next_state, step_cost = self.transition(state, action)
+            successors.append((action, next_state, step_cost))
+        return successors
+
+    def get_reverse_actions(self, state):
+        """Returns the actions that lead into a particular state.
+
+        This is part of the optional reverse transition model, which problems only need to implement in order to be
+        solved by strategies that search backwards from the goal state.
+
+        Args:
+            state: The state whose incoming actions are to be retrieved.
+
+        Returns:
+            An iterable containing every action `action` for which some state `previous_state` exists such that
+            taking `action` in `previous_state` leads to `state`.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support searching backwards')
+
+    def reverse_transition(self, state, action):
+        """This method defines the reverse transition model of the problem.
+
+        Given a state and an action that leads into it, it will return the state that the action was taken in along
+        with the step cost of that transition. This is part of the optional reverse transition model.
+
+        Args:
+            state: The current state.
+            action: An action that leads into `state`, as returned by `get_reverse_actions`.
+
+        Returns:
+            The tuple `(previous_state, step_cost)` where taking `action` in `previous_state` leads to `state` with a
+            cost of `step_cost`.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support searching backwards')
+
+    def state_space_size(self):
+        """Returns the number of ranks that `rank` can assign to the problem's states.
+
+        This is part of the optional ranking interface, which problems can implement to map their states onto dense
+        integers. Strategies can then keep track of states in flat arrays indexed by rank rather than in hash tables
+        of state objects, which takes far less memory.
+
+        Returns:
+            An integer `n` such that every state has a rank in the range `[0, n)`.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support ranking states')
+
+    def rank(self, state):
+        """Maps a state onto a dense integer. This is part of the optional ranking interface.
+
+        Args:
+            state: The state to be ranked.
+
+        Returns:
+            An integer in the range `[0, state_space_size())`, which is different for every state.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support ranking states')
+
+    def unrank(self, rank):
+        """Inverts `rank`, returning the state with a given rank. This is part of the optional ranking interface.
+
+        Args:
+            rank: The rank of the state, as returned by `rank`.
+
+        Returns:
+            The state with the given rank.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support ranking states')
+
+    def encode(self, state):
+        """Encodes a state as a non-negative integer.
+
+        Strategies use the codes in place of states in their explored sets and frontiers, so they must be cheap to
+        compute. Unlike `rank`, the codes do not need to be dense. The vectorized interface, of which this is part,
+        requires codes below `2 ** 64`.
+
+        Args:
+            state: The state to be encoded.
+
+        Returns:
+            An integer that is different for every state.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support encoding states')
+
+    def decode(self, code):
+        """Inverts `encode`, returning the state with a given code. This is part of the optional vectorized interface.
+
+        Args:
+            code: The code of the state, as returned by `encode`.
+
+        Returns:
+            The state with the given code.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support encoding states')
+
+    def batch_successors(self, codes):
+        """Generates the successors of many states at once. This is part of the optional vectorized interface.
+
+        Every action is assumed to have a step cost of one.
+
+        Args:
+            codes: A NumPy array of `uint64` codes of states, as returned by `encode`.
+
+        Returns:
+            The tuple `(parents, actions, children)` of equal-length NumPy arrays, with an entry for every successor
+            of every state in `codes`. `parents` holds the index in `codes` of the state the successor was generated
+            from, `actions` holds the index in `batch_actions` of the action that was taken, and `children` holds the
+            code of the successor.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support vectorized successor generation')
+
+    def canonical_key(self):
+        """Identifies the problem up to equivalence, so that its solutions can be cached.
+
+        Two problems that return the same key must have the same solutions once their actions are translated through
+        their action maps. A problem can, for example, map itself onto the same key as its mirror images.
+
+        Returns:
+            The tuple `(key, action_map)`, where `key` is a string and `action_map` is a dictionary that translates
+            each of the problem's actions into the corresponding action of the canonical problem, or None if the
+            actions are not translated.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support canonical keys')
+
+    def is_solvable(self):
+        """Checks cheaply whether the problem could have a solution.
+
+        Strategies call this before searching, so that they can reject problems whose goal cannot be reached without
+        exhausting the state space. Problems that have no such check should return True.
+
+        Returns:
+            False if the problem is known to have no solution and True otherwise.
+        """
+        return True
+
+    def serialized_size(self):
+        """Returns the number of bytes that `serialize` writes for each state.
+
+        This is part of the optional serialization interface, which allows states to be stored in files of
+        fixed-width records.
+
+        Returns:
+            The width in bytes of a serialized state.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support serializing states')
+
+    def serialize(self, state):
+        """Writes a state as bytes. This is part of the optional serialization interface.
+
+        Args:
+            state: The state to be serialized.
+
+        Returns:
+            A `bytes` object of length `serialized_size()`, which is different for every state.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support serializing states')
+
+    def deserialize(self, data):
+        """Inverts `serialize`. This is part of the optional serialization interface.
+
+        Args:
+            data: The bytes of a state, as returned by `serialize`.
+
+        Returns:
+            The state that was serialized.
+        """
+        raise NotImplementedError(f'{type(self).__name__} does not support serializing states')
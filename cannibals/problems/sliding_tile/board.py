@@ -3,40 +3,102 @@
 Author: Ryan Strauss
 """
 
+import functools
 import math
-import re
-from copy import copy
+
+# The characters used to write tiles in the string form of a board, indexed by tile number
+_TILE_CHARS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 
 
 class Board:
     """A board of a sliding tile puzzle.
 
-    This class constitutes a state of the sliding tile puzzle search problem."""
+    This class constitutes a state of the sliding tile puzzle search problem.
+
+    A board is constructed either from a string, in which each character is a tile (`'0'` is the blank and tiles above
+    9 are written as letters, so the 15-puzzle can be given as `'123456789ABCDEF0'`), or from a list of integers in
+    row-major order, which can express boards of any size.
+
+    Internally, the tiles are packed into a single integer with `tile_bits` bits per tile, where the tile in square
+    `i` occupies bits `i * tile_bits` through `(i + 1) * tile_bits - 1`. This makes hashing and equality checks O(1)
+    and allows a move to be made with a handful of bit operations.
+    """
+
+    __slots__ = ('board_size', 'tile_bits', 'packed', 'blank_index')
+
+    def __init__(self, tiles):
+        if isinstance(tiles, str):
+            tiles = [int(c, len(_TILE_CHARS)) for c in tiles]
+        else:
+            tiles = [int(t) for t in tiles]
+
+        board_size = int(math.sqrt(len(tiles)))
+        if board_size * board_size != len(tiles) or sorted(tiles) != list(range(len(tiles))):
+            raise ValueError(f'{tiles} is not a valid sliding tile board')
+
+        self.board_size = board_size
+        self.tile_bits = max(4, (len(tiles) - 1).bit_length())
+        self.packed = 0
+        for i, tile in enumerate(tiles):
+            self.packed |= tile << (i * self.tile_bits)
+        self.blank_index = tiles.index(0)
 
-    def __init__(self, tile_list):
-        self.board_size = int(math.sqrt(len(tile_list)))
-        self.tile_list = list(tile_list)
-        self.blank_pos = self._convert_index(tile_list.index('0'))
+    @classmethod
+    def _from_packed(cls, packed, board_size, tile_bits, blank_index):
+        board = cls.__new__(cls)
+        board.board_size = board_size
+        board.tile_bits = tile_bits
+        board.packed = packed
+        board.blank_index = blank_index
+        return board
 
     def __eq__(self, other):
-        return isinstance(other, Board) and self.tile_list == other.tile_list
+        return isinstance(other, Board) and self.packed == other.packed and self.board_size == other.board_size
 
     def __hash__(self):
-        return tuple(self.tile_list).__hash__()
+        return hash(self.packed)
 
     def __str__(self):
-        s = ''.join(self.tile_list).replace('0', '_')
-        lines = re.findall('.' * self.board_size, s)
-        return '\n'.join(lines)
-
-    def _convert_index(self, index):
-        if isinstance(index, int):
-            row = index // self.board_size
-            col = index % self.board_size
-            return row, col
+        tiles = self.tiles
+        if len(tiles) <= len(_TILE_CHARS):
+            cells = [_TILE_CHARS[tile] if tile else '_' for tile in tiles]
+            sep = ''
         else:
-            row, col = index
-            return row * self.board_size + col
+            width = len(str(len(tiles) - 1))
+            cells = [str(tile).rjust(width) if tile else '_' * width for tile in tiles]
+            sep = ' '
+        rows = [sep.join(cells[i:i + self.board_size]) for i in range(0, len(cells), self.board_size)]
+        return '\n'.join(rows)
+
+    def __repr__(self):
+        return f'Board({list(self.tiles)})'
+
+    @property
+    def blank_pos(self):
+        """The `(row, column)` position of the blank."""
+        return divmod(self.blank_index, self.board_size)
+
+    @property
+    def tiles(self):
+        """A tuple of the tiles on the board in row-major order, where 0 is the blank."""
+        mask = (1 << self.tile_bits) - 1
+        return tuple((self.packed >> (i * self.tile_bits)) & mask for i in range(self.board_size * self.board_size))
+
+    @property
+    def tile_list(self):
+        """A list of the tiles on the board in row-major order, where 0 is the blank."""
+        return list(self.tiles)
+
+    def tile_at(self, index):
+        """Returns the tile in a given square.
+
+        Args:
+            index: The row-major index of the square.
+
+        Returns:
+            The tile in that square, where 0 is the blank.
+        """
+        return (self.packed >> (index * self.tile_bits)) & ((1 << self.tile_bits) - 1)
 
     def move(self, action):
         """Returns the board that results from taking a given action in this board.
@@ -47,19 +109,54 @@ class Board:
         Returns:
             A board that reflects the transition from the given action.
         """
-        if action == 'U':
-            swap_pos = self.blank_pos[0] - 1, self.blank_pos[1]
-        elif action == 'D':
-            swap_pos = self.blank_pos[0] + 1, self.blank_pos[1]
-        elif action == 'L':
-            swap_pos = self.blank_pos[0], self.blank_pos[1] - 1
-        elif action == 'R':
-            swap_pos = self.blank_pos[0], self.blank_pos[1] + 1
-        else:
+        swap_index = move_table(self.board_size)[self.blank_index].get(action)
+        if swap_index is None:
             raise ValueError(f'{action} is not a valid action')
+        return self.swap_blank(swap_index)
+
+    def swap_blank(self, swap_index):
+        """Returns the board in which the blank has been swapped with the tile in a given square.
+
+        The square is not checked to be adjacent to the blank, so this is meant for callers that take their moves from
+        `move_table`, which only contains legal ones.
+
+        Args:
+            swap_index: The row-major index of the square whose tile is moved into the blank's square.
+
+        Returns:
+            A board with the blank in the given square.
+        """
+        # The blank's bits are always zero, so the tile can be cleared from its square with an XOR and set in the
+        # blank's square with an OR
+        tile = self.tile_at(swap_index)
+        packed = (self.packed ^ (tile << (swap_index * self.tile_bits))) | (tile << (self.blank_index * self.tile_bits))
+        return Board._from_packed(packed, self.board_size, self.tile_bits, swap_index)
+
+
+@functools.lru_cache(maxsize=None)
+def move_table(board_size):
+    """Computes the legal moves of the blank for every square of a board.
+
+    The table is cached, so it is only computed once for each board size.
+
+    Args:
+        board_size: The number of rows (and columns) of the board.
 
-        new_tile_list = copy(self.tile_list)
-        temp = new_tile_list[self._convert_index(swap_pos)]
-        new_tile_list[self._convert_index(swap_pos)] = '0'
-        new_tile_list[self._convert_index(self.blank_pos)] = temp
-        return Board(new_tile_list)
+    Returns:
+        A list that gives, for each square the blank can be in, a dictionary mapping each legal action to the square
+        the blank moves to. The actions are in the order 'U', 'D', 'L', 'R'.
+    """
+    table = []
+    for index in range(board_size * board_size):
+        row, col = divmod(index, board_size)
+        moves = {}
+        if row > 0:
+            moves['U'] = index - board_size
+        if row < board_size - 1:
+            moves['D'] = index + board_size
+        if col > 0:
+            moves['L'] = index - 1
+        if col < board_size - 1:
+            moves['R'] = index + 1
+        table.append(moves)
+    return table
@@ -3,24 +3,82 @@
 Author: Ryan Strauss
 """
 
+import bisect
+import functools
+from collections import namedtuple
+
 from cannibals.problems.sliding_tile import SlidingTilePuzzle
 
+_GoalTables = namedtuple('_GoalTables', ['board_size', 'goal_row', 'goal_col', 'manhattan'])
+
 
-def make_heuristic_fn(problem, heuristic_fn):
+def make_heuristic_fn(problem, heuristic_fn, incremental=False, batch=False):
     """Makes a heuristic function for the sliding tile puzzle.
 
     This function should be used to construct the function that will be passed to the search strategy.
 
     Args:
         problem: The `SlidingTilePuzzle` for which a heuristic function should be constructed.
-        heuristic_fn: The heuristic function being used. E.g. `misplaced_tiles`.
+        heuristic_fn: The heuristic function being used. E.g. `misplaced_tiles`, or a `PatternDatabase`.
+        incremental: If True, the returned function is given an `incremental` attribute, which the search strategies
+            use to compute the heuristic value of a successor from the value of the node it was generated from. This
+            is only supported by `manhattan_distance` and `linear_conflict`. Defaults to False.
+        batch: If True, the returned function is given a `batch` attribute, which accepts a list of states and
+            returns a list of their heuristic values. The search strategies use it to evaluate many states with a
+            single call, which is computed with NumPy. This is only supported by `misplaced_tiles` and
+            `manhattan_distance`. Defaults to False.
 
     Returns:
         A function that accepts a single state as an argument and returns the estimated cost of that state, using the
         provided heuristic.
     """
     assert isinstance(problem, SlidingTilePuzzle)
-    return lambda state: heuristic_fn(state, problem.goal_state)
+    goal = problem.goal_state
+    # Build the goal's lookup tables up front rather than on the first evaluation
+    _goal_tables(goal)
+
+    fn = lambda state: heuristic_fn(state, goal)
+    if incremental:
+        if heuristic_fn not in _INCREMENTAL_UPDATES:
+            name = getattr(heuristic_fn, '__name__', heuristic_fn)
+            raise ValueError(f'{name} does not support incremental evaluation')
+        update_fn = _INCREMENTAL_UPDATES[heuristic_fn]
+        fn.incremental = lambda parent_state, parent_value, state: update_fn(parent_state, parent_value, state, goal)
+    if batch:
+        if heuristic_fn not in _BATCH_EVALUATIONS:
+            name = getattr(heuristic_fn, '__name__', heuristic_fn)
+            raise ValueError(f'{name} does not support batch evaluation')
+        batch_fn = _BATCH_EVALUATIONS[heuristic_fn]
+        fn.batch = lambda states: batch_fn(states, goal)
+    return fn
+
+
+@functools.lru_cache(maxsize=32)
+def _goal_tables(goal):
+    """Computes the lookup tables that the heuristics use for a particular goal board.
+
+    The tables are cached, so they are only computed once for each goal.
+
+    Args:
+        goal: The goal board.
+
+    Returns:
+        A `_GoalTables` tuple, where `goal_row[tile]` and `goal_col[tile]` give the goal position of each tile and
+        `manhattan[tile][index]` gives the Manhattan distance of `tile` from its goal when it is in square `index`.
+        The blank is always given a distance of zero.
+    """
+    size = goal.board_size
+    goal_row = [0] * (size * size)
+    goal_col = [0] * (size * size)
+    for index, tile in enumerate(goal.tiles):
+        goal_row[tile], goal_col[tile] = divmod(index, size)
+
+    manhattan = [[0] * (size * size)]
+    for tile in range(1, size * size):
+        manhattan.append([abs(index // size - goal_row[tile]) + abs(index % size - goal_col[tile])
+                          for index in range(size * size)])
+
+    return _GoalTables(size, goal_row, goal_col, manhattan)
 
 
 def misplaced_tiles(state, goal):
@@ -41,3 +99,143 @@ def misplaced_tiles(state, goal):
         if a != b:
             count += 1
     return count
+
+
+def manhattan_distance(state, goal):
+    """Computes the Manhattan distance heuristic.
+
+    This heuristic sums, over all tiles, the number of rows and columns that separate each tile from its goal
+    position. It is admissible and consistent.
+
+    Args:
+        state: The current state being evaluated.
+        goal: The goal state.
+
+    Returns:
+        The heuristic value, which is the sum of the Manhattan distances of the tiles from their goal positions.
+    """
+    manhattan = _goal_tables(goal).manhattan
+    return sum(manhattan[tile][index] for index, tile in enumerate(state.tiles))
+
+
+def linear_conflict(state, goal):
+    """Computes the linear conflict heuristic.
+
+    Two tiles are in linear conflict if they are in the same row (or column), both have their goal positions in that
+    row (or column), and they are in the reverse order of their goal positions. One of them must then leave the line
+    and come back, which costs two moves that the Manhattan distance does not account for. For each line, this
+    heuristic adds two moves for every tile that has to be removed to resolve all of its conflicts. It is admissible
+    and dominates the Manhattan distance.
+
+    Args:
+        state: The current state being evaluated.
+        goal: The goal state.
+
+    Returns:
+        The heuristic value, which is the Manhattan distance plus the cost of resolving linear conflicts.
+    """
+    tables = _goal_tables(goal)
+    removals = sum(_line_removals(state, tables, line, True) + _line_removals(state, tables, line, False)
+                   for line in range(tables.board_size))
+    return manhattan_distance(state, goal) + 2 * removals
+
+
+def _line_removals(state, tables, line, is_row):
+    """Counts the tiles that must leave a row or column to resolve the linear conflicts in it.
+
+    This is the number of tiles in the line that belong to it, minus the length of the longest subsequence of them
+    that is already in goal order.
+    """
+    size = tables.board_size
+    if is_row:
+        indices = range(line * size, (line + 1) * size)
+        goal_line, goal_order = tables.goal_row, tables.goal_col
+    else:
+        indices = range(line, size * size, size)
+        goal_line, goal_order = tables.goal_col, tables.goal_row
+
+    # Patience sorting gives the length of the longest increasing subsequence
+    piles = []
+    count = 0
+    for index in indices:
+        tile = state.tile_at(index)
+        if tile and goal_line[tile] == line:
+            count += 1
+            pile = bisect.bisect_left(piles, goal_order[tile])
+            if pile == len(piles):
+                piles.append(goal_order[tile])
+            else:
+                piles[pile] = goal_order[tile]
+    return count - len(piles)
+
+
+def _manhattan_distance_update(parent_state, parent_value, state, goal):
+    # The tile that moved went from the square that the blank now occupies to where the blank used to be
+    manhattan = _goal_tables(goal).manhattan
+    tile = state.tile_at(parent_state.blank_index)
+    return parent_value + manhattan[tile][parent_state.blank_index] - manhattan[tile][state.blank_index]
+
+
+def _linear_conflict_update(parent_state, parent_value, state, goal):
+    # A tile that moves along a row stays in the same position relative to the other tiles in that row, so only the
+    # two columns it moved between can change their conflicts (and vice versa for a move along a column)
+    tables = _goal_tables(goal)
+    old_row, old_col = divmod(state.blank_index, tables.board_size)
+    new_row, new_col = divmod(parent_state.blank_index, tables.board_size)
+    if old_row == new_row:
+        lines, is_row = (old_col, new_col), False
+    else:
+        lines, is_row = (old_row, new_row), True
+
+    delta = sum(_line_removals(state, tables, line, is_row) - _line_removals(parent_state, tables, line, is_row)
+                for line in lines)
+    return _manhattan_distance_update(parent_state, parent_value, state, goal) + 2 * delta
+
+
+@functools.lru_cache(maxsize=32)
+def _goal_arrays(goal):
+    """Returns the goal's tiles and Manhattan distance table as NumPy arrays, for the batch heuristics."""
+    import numpy as np
+
+    return np.array(goal.tiles), np.array(_goal_tables(goal).manhattan)
+
+
+def _tile_array(states):
+    """Unpacks the tiles of a list of boards into a two-dimensional NumPy array, with a row for each board."""
+    import numpy as np
+
+    board = states[0]
+    num_squares = board.board_size * board.board_size
+    if num_squares * board.tile_bits > 64:
+        return np.array([state.tiles for state in states])
+    packed = np.fromiter((state.packed for state in states), dtype=np.uint64, count=len(states))
+    shifts = np.arange(num_squares, dtype=np.uint64) * np.uint64(board.tile_bits)
+    return ((packed[:, None] >> shifts) & np.uint64((1 << board.tile_bits) - 1)).astype(np.intp)
+
+
+def _misplaced_tiles_batch(states, goal):
+    if not states:
+        return []
+    goal_tiles, _ = _goal_arrays(goal)
+    return (_tile_array(states) != goal_tiles).sum(axis=1).tolist()
+
+
+def _manhattan_distance_batch(states, goal):
+    if not states:
+        return []
+    import numpy as np
+
+    _, manhattan = _goal_arrays(goal)
+    tiles = _tile_array(states)
+    return manhattan[tiles, np.arange(tiles.shape[1])].sum(axis=1).tolist()
+
+
+_INCREMENTAL_UPDATES = {
+    manhattan_distance: _manhattan_distance_update,
+    linear_conflict: _linear_conflict_update,
+}
+
+_BATCH_EVALUATIONS = {
+    misplaced_tiles: _misplaced_tiles_batch,
+    manhattan_distance: _manhattan_distance_batch,
+}
@@ -0,0 +1,244 @@
+"""Provides additive pattern database heuristics for the sliding tile puzzle.
+
+Author: Ryan Strauss
+"""
+
+import json
+import math
+import mmap
+import struct
+from collections import deque
+
+from cannibals.problems.sliding_tile.board import Board
+
+_MAGIC = b'CANNIBALS-PDB\x01'
+_UNSEEN = 255
+
+
+def _rank(positions, num_squares):
+    """Computes a perfect hash of a sequence of distinct squares.
+
+    The sequences of `k` distinct squares out of `num_squares` are mapped onto the integers `0` through
+    `num_squares! / (num_squares - k)! - 1`.
+    """
+    rank = 0
+    for i, position in enumerate(positions):
+        smaller = 0
+        for previous in positions[:i]:
+            if previous < position:
+                smaller += 1
+        rank = rank * (num_squares - i) + position - smaller
+    return rank
+
+
+def _unrank(rank, length, num_squares):
+    """Inverts `_rank`, returning the sequence of squares with the given rank."""
+    digits = []
+    for i in reversed(range(length)):
+        rank, digit = divmod(rank, num_squares - i)
+        digits.append(digit)
+    free = list(range(num_squares))
+    return [free.pop(digit) for digit in reversed(digits)]
+
+
+def _neighbors(num_squares, board_size):
+    """Lists the squares adjacent to each square of the board."""
+    neighbors = []
+    for index in range(num_squares):
+        row, col = divmod(index, board_size)
+        adjacent = []
+        if row > 0:
+            adjacent.append(index - board_size)
+        if row < board_size - 1:
+            adjacent.append(index + board_size)
+        if col > 0:
+            adjacent.append(index - 1)
+        if col < board_size - 1:
+            adjacent.append(index + 1)
+        neighbors.append(adjacent)
+    return neighbors
+
+
+def _build_table(goal, group):
+    """Computes the distance table for a single group of tiles.
+
+    This runs a breadth-first search backwards from the goal over abstract states, which consist of the squares of
+    the group's tiles and of the blank. Moving one of the group's tiles costs one move while moving any other tile
+    is free, so the search is a 0-1 breadth-first search. The table then keeps, for each placement of the group's
+    tiles, the smallest distance over all positions of the blank.
+    """
+    num_squares = goal.board_size * goal.board_size
+    neighbors = _neighbors(num_squares, goal.board_size)
+    goal_tiles = goal.tiles
+    table_size = math.factorial(num_squares) // math.factorial(num_squares - len(group))
+
+    distances = bytearray([_UNSEEN]) * (table_size * num_squares)
+    start = _rank([goal_tiles.index(tile) for tile in group], num_squares) * num_squares + goal.blank_index
+    distances[start] = 0
+    queue = deque([start])
+
+    while queue:
+        encoded = queue.popleft()
+        distance = distances[encoded]
+        pattern_rank, blank = divmod(encoded, num_squares)
+        positions = _unrank(pattern_rank, len(group), num_squares)
+
+        for swap in neighbors[blank]:
+            if swap in positions:
+                # One of the group's tiles slides into the blank
+                next_positions = list(positions)
+                next_positions[positions.index(swap)] = blank
+                next_encoded = _rank(next_positions, num_squares) * num_squares + swap
+                step_cost = 1
+            else:
+                next_encoded = pattern_rank * num_squares + swap
+                step_cost = 0
+
+            if distance + step_cost < distances[next_encoded]:
+                distances[next_encoded] = distance + step_cost
+                if step_cost:
+                    queue.append(next_encoded)
+                else:
+                    queue.appendleft(next_encoded)
+
+    table = bytearray(table_size)
+    for pattern_rank in range(table_size):
+        table[pattern_rank] = min(distances[pattern_rank * num_squares:(pattern_rank + 1) * num_squares])
+    return table
+
+
+class PatternDatabase:
+    """An additive pattern database heuristic for the sliding tile puzzle.
+
+    The tiles are partitioned into disjoint groups. For each group, a table stores the number of moves of that group's
+    tiles that are needed to bring them to their goal squares, for every placement of them on the board. Since each
+    move only moves a single tile, the values of the different groups can be added together, which gives an
+    admissible heuristic that is far stronger than the Manhattan distance.
+
+    Each table is indexed by a perfect hash of the squares occupied by the group's tiles and stores one byte per
+    entry. Databases can be saved to a file and loaded with `mmap`, so that several processes using the same file
+    share a single copy of it in memory and loading takes no time.
+
+    A pattern database is used as a heuristic function, through `make_heuristic_fn`:
+
+        pdb = PatternDatabase.build(problem.goal_state, [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12, 13, 14, 15]])
+        pdb.save('15puzzle.pdb')
+        heuristic_fn = make_heuristic_fn(problem, PatternDatabase.load('15puzzle.pdb'))
+    """
+
+    def __init__(self, goal, groups, tables, path=None):
+        """Constructs a new `PatternDatabase`.
+
+        Databases should usually be created with `build` or `load` rather than directly.
+
+        Args:
+            goal: The goal `Board` that the database was built for.
+            groups: A list of the disjoint groups of tiles, each of which is a list of tiles.
+            tables: A list with the distance table of each group. Each table is a bytes-like object.
+            path: The file that the database was loaded from, if any.
+        """
+        self.goal = goal
+        self.groups = [list(group) for group in groups]
+        self._tables = tables
+        self._path = path
+
+    def __call__(self, state, goal):
+        """Computes the pattern database heuristic.
+
+        Args:
+            state: The current state being evaluated.
+            goal: The goal state. This must be the goal that the database was built for.
+
+        Returns:
+            The heuristic value, which is the sum of the stored distances of each group of tiles.
+        """
+        if goal != self.goal:
+            raise ValueError('the pattern database was built for a different goal')
+        num_squares = len(self.goal.tiles)
+        positions = [0] * num_squares
+        for index, tile in enumerate(state.tiles):
+            positions[tile] = index
+        return sum(table[_rank([positions[tile] for tile in group], num_squares)]
+                   for group, table in zip(self.groups, self._tables))
+
+    def __reduce__(self):
+        # Databases that are backed by a file are reloaded from it rather than copied between processes
+        if self._path is not None:
+            return PatternDatabase.load, (self._path,)
+        return PatternDatabase, (self.goal, self.groups, [bytes(table) for table in self._tables])
+
+    @classmethod
+    def build(cls, goal, groups):
+        """Builds a pattern database by searching backwards from the goal for each group of tiles.
+
+        The time and memory needed grow with `n! / (n - k)!`, where `n` is the number of squares on the board and `k`
+        is the number of tiles in a group. Groups of up to five or six tiles are practical for the 15-puzzle.
+
+        Args:
+            goal: The goal state, such as `SlidingTilePuzzle.goal_state`. Either a `Board` or anything that a `Board`
+                can be constructed from.
+            groups: A list of disjoint groups of tiles, each of which is a list of (non-blank) tiles. The groups do
+                not need to cover every tile, although the heuristic is stronger when they do.
+
+        Returns:
+            The new `PatternDatabase`.
+        """
+        if not isinstance(goal, Board):
+            goal = Board(goal)
+        tiles = [tile for group in groups for tile in group]
+        if len(tiles) != len(set(tiles)) or not set(tiles) <= set(range(1, len(goal.tiles))):
+            raise ValueError('groups must be disjoint and contain only non-blank tiles of the board')
+        return cls(goal, groups, [_build_table(goal, group) for group in groups])
+
+    def save(self, path):
+        """Saves the pattern database to a file.
+
+        Args:
+            path: The path of the file to write.
+
+        Returns:
+            None.
+        """
+        header = json.dumps({
+            'goal': list(self.goal.tiles),
+            'groups': self.groups,
+            'sizes': [len(table) for table in self._tables]
+        }).encode()
+        with open(path, 'wb') as fp:
+            fp.write(_MAGIC)
+            fp.write(struct.pack('<I', len(header)))
+            fp.write(header)
+            for table in self._tables:
+                fp.write(table)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a pattern database that was saved with `save`.
+
+        The file is memory-mapped rather than read, so the tables are paged in as they are used and are shared with
+        any other process that maps the same file.
+
+        Args:
+            path: The path of the file to load.
+
+        Returns:
+            The loaded `PatternDatabase`.
+        """
+        with open(path, 'rb') as fp:
+            buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if buffer[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f'{path} is not a pattern database file')
+        offset = len(_MAGIC)
+        header_length, = struct.unpack_from('<I', buffer, offset)
+        offset += 4
+        header = json.loads(bytes(buffer[offset:offset + header_length]).decode())
+        offset += header_length
+
+        view = memoryview(buffer)
+        tables = []
+        for size in header['sizes']:
+            tables.append(view[offset:offset + size])
+            offset += size
+
+        return cls(Board(header['goal']), header['groups'], tables, path=path)
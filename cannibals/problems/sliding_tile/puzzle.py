@@ -3,10 +3,11 @@
 Author: Ryan Strauss
 """
 
-from copy import copy
+import functools
+import math
 
 from cannibals.problems.base import AbstractProblem
-from cannibals.problems.sliding_tile.board import Board
+from cannibals.problems.sliding_tile.board import Board, move_table
 
 
 class SlidingTilePuzzle(AbstractProblem):
@@ -24,32 +25,273 @@ class SlidingTilePuzzle(AbstractProblem):
     """
 
     VALID_ACTIONS = ['U', 'D', 'L', 'R']
+    INVERSE_ACTIONS = {'U': 'D', 'D': 'U', 'L': 'R', 'R': 'L'}
+    batch_actions = VALID_ACTIONS
 
-    def __init__(self, initial_state, goal_state='123456780'):
-        if isinstance(initial_state, str):
+    def __init__(self, initial_state, goal_state=None):
+        """Constructs a new `SlidingTilePuzzle`.
+
+        Args:
+            initial_state: The initial board. Either a `Board` or anything that a `Board` can be constructed from,
+                such as the string `'635841027'` or a list of integers.
+            goal_state: The goal board, in the same forms as `initial_state`. Defaults to None, in which case the
+                goal has the tiles in ascending order followed by the blank (e.g. `'123456780'` for the 8-puzzle).
+        """
+        if not isinstance(initial_state, Board):
             initial_state = Board(initial_state)
-        assert isinstance(initial_state, Board)
-        if isinstance(goal_state, str):
+        if goal_state is None:
+            num_tiles = initial_state.board_size * initial_state.board_size
+            goal_state = list(range(1, num_tiles)) + [0]
+        if not isinstance(goal_state, Board):
             goal_state = Board(goal_state)
-        assert isinstance(goal_state, Board)
+        assert initial_state.board_size == goal_state.board_size
 
         super().__init__(initial_state)
         self.goal_state = goal_state
 
     def get_actions(self, state):
-        actions = copy(self.VALID_ACTIONS)
-        if state.blank_pos[0] == 0:
-            actions.remove('U')
-        if state.blank_pos[0] == state.board_size - 1:
-            actions.remove('D')
-        if state.blank_pos[1] == 0:
-            actions.remove('L')
-        if state.blank_pos[1] == state.board_size - 1:
-            actions.remove('R')
-        return actions
+        return list(move_table(state.board_size)[state.blank_index])
 
     def goal_test(self, state):
-        return state.tile_list == self.goal_state.tile_list
+        return state == self.goal_state
 
     def transition(self, state, action):
         return state.move(action), 1.0
+
+    def successors(self, state, parent_action=None):
+        # Moving the blank back to where it came from only leads to the parent's state, so that move is skipped
+        undo = self.INVERSE_ACTIONS.get(parent_action)
+        return [(action, state.swap_blank(swap_index), 1.0)
+                for action, swap_index in move_table(state.board_size)[state.blank_index].items() if action != undo]
+
+    def get_reverse_actions(self, state):
+        return [self.INVERSE_ACTIONS[action] for action in self.get_actions(state)]
+
+    def reverse_transition(self, state, action):
+        return state.move(self.INVERSE_ACTIONS[action]), 1.0
+
+    def state_space_size(self):
+        return math.factorial(self.initial_state.board_size * self.initial_state.board_size)
+
+    def rank(self, state):
+        # The Lehmer code of the permutation of tiles, where the digit of each square is the number of tiles after
+        # it that are smaller. Counting the smaller tiles that have already been seen gives the same digits.
+        num_squares = state.board_size * state.board_size
+        # A lookup table is faster than counting bits, but it grows too large beyond the 15-puzzle
+        popcount = _popcount_table(num_squares) if num_squares <= 16 else _PopCount()
+        packed, tile_bits = state.packed, state.tile_bits
+        mask = (1 << tile_bits) - 1
+        rank = 0
+        seen = 0
+        for i in range(num_squares):
+            tile = packed & mask
+            packed >>= tile_bits
+            rank = rank * (num_squares - i) + tile - popcount[seen & ((1 << tile) - 1)]
+            seen |= 1 << tile
+        return rank
+
+    def unrank(self, rank):
+        board = self.initial_state
+        num_squares = board.board_size * board.board_size
+        digits = []
+        for i in range(1, num_squares + 1):
+            rank, digit = divmod(rank, i)
+            digits.append(digit)
+
+        remaining = list(range(num_squares))
+        packed = 0
+        blank_index = 0
+        for i, digit in enumerate(reversed(digits)):
+            tile = remaining.pop(digit)
+            packed |= tile << (i * board.tile_bits)
+            if not tile:
+                blank_index = i
+        return Board._from_packed(packed, board.board_size, board.tile_bits, blank_index)
+
+    def encode(self, state):
+        return state.packed
+
+    def decode(self, code):
+        board = self.initial_state
+        mask = (1 << board.tile_bits) - 1
+        blank_index = next(i for i in range(board.board_size * board.board_size)
+                           if not (code >> (i * board.tile_bits)) & mask)
+        return Board._from_packed(code, board.board_size, board.tile_bits, blank_index)
+
+    def serialized_size(self):
+        board = self.initial_state
+        return (board.board_size * board.board_size * board.tile_bits + 7) // 8
+
+    def serialize(self, state):
+        return state.packed.to_bytes(self.serialized_size(), 'big')
+
+    def deserialize(self, data):
+        return self.decode(int.from_bytes(data, 'big'))
+
+    def batch_successors(self, codes):
+        import numpy as np
+
+        board = self.initial_state
+        num_squares = board.board_size * board.board_size
+        if num_squares * board.tile_bits > 64:
+            raise ValueError('boards larger than the 15-puzzle cannot be encoded in 64 bits')
+        tile_bits = np.uint64(board.tile_bits)
+        mask = np.uint64((1 << board.tile_bits) - 1)
+
+        blank = np.zeros(len(codes), dtype=np.int64)
+        for index in range(1, num_squares):
+            is_blank = (codes >> np.uint64(index * board.tile_bits)) & mask == 0
+            blank[is_blank] = index
+
+        parents, actions, children = [], [], []
+        for action, swap_table in enumerate(_swap_tables(board.board_size)):
+            swap = np.asarray(swap_table)[blank]
+            parent = np.flatnonzero(swap >= 0)
+            swap = swap[parent].astype(np.uint64) * tile_bits
+            blank_shift = blank[parent].astype(np.uint64) * tile_bits
+            code = codes[parent]
+            tile = (code >> swap) & mask
+            parents.append(parent)
+            actions.append(np.full(len(parent), action, dtype=np.uint8))
+            children.append((code ^ (tile << swap)) | (tile << blank_shift))
+        return np.concatenate(parents), np.concatenate(actions), np.concatenate(children)
+
+    def is_solvable(self):
+        # Every move swaps the blank with a tile, which changes the parity of the permutation of the squares and moves
+        # the blank by one square. So the goal can only be reached if the parity of the permutation that takes the
+        # initial board to the goal matches the parity of the Manhattan distance between the two blanks.
+        goal_index = [0] * len(self.goal_state.tiles)
+        for index, tile in enumerate(self.goal_state.tiles):
+            goal_index[tile] = index
+        _, inversions = _count_inversions([goal_index[tile] for tile in self.initial_state.tiles])
+
+        initial_row, initial_col = self.initial_state.blank_pos
+        goal_row, goal_col = self.goal_state.blank_pos
+        return inversions % 2 == (abs(initial_row - goal_row) + abs(initial_col - goal_col)) % 2
+
+    def canonical_key(self):
+        # Each symmetry of the square is applied to both boards, and the tiles are then renumbered in the order they
+        # appear in the goal, so that only the position of the goal's blank and the renumbered initial board remain.
+        # The smallest of the resulting keys is the canonical one.
+        size = self.initial_state.board_size
+        initial_tiles, goal_tiles = self.initial_state.tiles, self.goal_state.tiles
+        best = None
+        for squares, action_map in _symmetries(size):
+            initial, goal = [0] * len(squares), [0] * len(squares)
+            for index, square in enumerate(squares):
+                initial[square] = initial_tiles[index]
+                goal[square] = goal_tiles[index]
+
+            labels = [0] * len(goal)
+            next_label = 1
+            for tile in goal:
+                if tile:
+                    labels[tile] = next_label
+                    next_label += 1
+            key = goal.index(0), tuple(labels[tile] for tile in initial)
+            if best is None or key < best[0]:
+                best = key, action_map
+
+        (goal_blank, initial), action_map = best
+        return f'{size}:{goal_blank}:{",".join(map(str, initial))}', action_map
+
+
+def _count_inversions(sequence):
+    """Counts the pairs of elements of a sequence that are out of order, with a merge sort in O(n log n) time.
+
+    Returns:
+        The tuple `(sorted_sequence, inversions)`.
+    """
+    if len(sequence) < 2:
+        return list(sequence), 0
+    middle = len(sequence) // 2
+    left, left_inversions = _count_inversions(sequence[:middle])
+    right, right_inversions = _count_inversions(sequence[middle:])
+
+    merged = []
+    inversions = left_inversions + right_inversions
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            # The element of `right` is out of order with every element of `left` that has not been merged yet
+            merged.append(right[j])
+            inversions += len(left) - i
+            j += 1
+    merged.extend(left[i:])
+    merged.extend(right[j:])
+    return merged, inversions
+
+
+@functools.lru_cache(maxsize=None)
+def _symmetries(board_size):
+    """Lists the eight symmetries of a square board, which are its rotations and reflections.
+
+    Returns:
+        A list with a tuple `(squares, action_map)` for each symmetry, where `squares[index]` is the square that
+        square `index` is moved to and `action_map` gives the action that each action becomes.
+    """
+    last = board_size - 1
+    transforms = [
+        lambda row, col: (row, col),
+        lambda row, col: (col, last - row),
+        lambda row, col: (last - row, last - col),
+        lambda row, col: (last - col, row),
+        lambda row, col: (row, last - col),
+        lambda row, col: (last - row, col),
+        lambda row, col: (col, row),
+        lambda row, col: (last - col, last - row),
+    ]
+    directions = {'U': (-1, 0), 'D': (1, 0), 'L': (0, -1), 'R': (0, 1)}
+    actions = {direction: action for action, direction in directions.items()}
+
+    symmetries = []
+    for transform in transforms:
+        squares = []
+        for index in range(board_size * board_size):
+            row, col = transform(*divmod(index, board_size))
+            squares.append(row * board_size + col)
+        # The transforms are affine, so the direction of a move is where the transform takes the vector of the move
+        origin = transform(0, 0)
+        action_map = {}
+        for action, (row, col) in directions.items():
+            moved = transform(row, col)
+            action_map[action] = actions[moved[0] - origin[0], moved[1] - origin[1]]
+        symmetries.append((squares, action_map))
+    return symmetries
+
+
+@functools.lru_cache(maxsize=None)
+def _swap_tables(board_size):
+    """Computes the move tables that `batch_successors` uses for a board size.
+
+    Returns:
+        A tuple with a table for each action of `VALID_ACTIONS`, which gives the square that the blank moves to from
+        each square, or -1 if the action cannot be taken there.
+    """
+    tables = ([], [], [], [])
+    for index in range(board_size * board_size):
+        row, col = divmod(index, board_size)
+        tables[0].append(index - board_size if row > 0 else -1)
+        tables[1].append(index + board_size if row < board_size - 1 else -1)
+        tables[2].append(index - 1 if col > 0 else -1)
+        tables[3].append(index + 1 if col < board_size - 1 else -1)
+    return tables
+
+
+@functools.lru_cache(maxsize=None)
+def _popcount_table(num_squares):
+    """Returns a table of the number of set bits in every integer below `2 ** (num_squares - 1)`."""
+    table = bytearray(1 << (num_squares - 1))
+    for i in range(1, len(table)):
+        table[i] = table[i >> 1] + (i & 1)
+    return table
+
+
+class _PopCount:
+    """Counts set bits on demand, with the same interface as the table returned by `_popcount_table`."""
+
+    def __getitem__(self, value):
+        return bin(value).count('1')
@@ -1,5 +1,37 @@
+import importlib
+
+from .base import SearchObserver
+from .base import SearchLimits
+from .base import SearchResult
 from .base import SearchStrategy
+from .bidirectional_search import BidirectionalAStarSearch
+from .bidirectional_search import BidirectionalBreadthFirstSearch
 from .informed_search import AStarSearch
+from .informed_search import AnytimeWeightedAStarSearch
+from .informed_search import FocalSearch
+from .informed_search import GreedyBestFirstSearch
+from .informed_search import IterativeDeepeningAStarSearch
+from .informed_search import WeightedAStarSearch
 from .uninformed_search import BreadthFirstSearch
 from .uninformed_search import DepthFirstSearch
+from .uninformed_search import IterativeDeepeningSearch
 from .uninformed_search import UniformCostSearch
+
+# Strategies whose modules pull in heavier dependencies are imported when they are first accessed, so that importing
+# this package stays cheap for short-lived processes
+_LAZY_STRATEGIES = {
+    'ExternalBreadthFirstSearch': 'external',
+    'VectorizedBreadthFirstSearch': 'vectorized',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_STRATEGIES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{_LAZY_STRATEGIES[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_STRATEGIES))
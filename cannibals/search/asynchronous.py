@@ -0,0 +1,98 @@
+"""Provides a way to run searches from asyncio code without blocking the event loop.
+
+Author: Ryan Strauss
+"""
+
+import asyncio
+import threading
+import time
+
+from cannibals.search.base import SearchStrategy, SearchResult
+from cannibals.search.batch import _BudgetedProblem, _BudgetExceeded
+
+
+class _CooperativeProblem(_BudgetedProblem):
+    """Wraps a problem so that a search over it can be cancelled and can report its progress from another thread.
+
+    Cancellation is checked wherever `_BudgetedProblem` checks its deadline, which is whenever the search asks for the
+    successors or actions of a state, so it works with every search strategy.
+    """
+
+    def __init__(self, problem, max_nodes, timeout, cancelled, progress_fn, progress_interval):
+        super().__init__(problem, max_nodes, timeout)
+        self._cancelled = cancelled
+        self._progress_fn = progress_fn
+        self._progress_interval = progress_interval
+
+    def _check_deadline(self):
+        if self._cancelled.is_set():
+            raise _BudgetExceeded('cancelled')
+        super()._check_deadline()
+
+    def _count_node(self):
+        super()._count_node()
+        if self._progress_fn is not None and self.nodes_generated % self._progress_interval == 0:
+            self._progress_fn(self.nodes_generated)
+
+
+async def search_async(strategy, problem, timeout=None, deadline=None, max_nodes=None, progress_fn=None,
+                       progress_interval=10000, executor=None, **kwargs):
+    """Solves a problem in a worker thread, so that the event loop keeps running while the search does.
+
+    The search is run with the existing strategy, on a wrapper around the problem that checks for cancellation, the
+    deadline and the node budget as successors are generated. If the task awaiting this coroutine is cancelled, the
+    search stops at its next check and `asyncio.CancelledError` is raised as usual.
+
+    The search holds the GIL while it runs, but Python switches between threads regularly, so the event loop stays
+    responsive. A thread pool is used rather than a process pool, since the cancellation flag and progress callbacks
+    have to be shared with the search.
+
+        result = await search_async(AStarSearch, problem, timeout=5.0, heuristic_fn=heuristic_fn)
+
+    Args:
+        strategy: The `SearchStrategy` subclass that will be used to solve the problem.
+        problem: The `AbstractProblem` instance that is to be solved.
+        timeout: The maximum number of seconds the search may take, or None for no limit.
+        deadline: The time, according to the event loop's `time()`, by which the search must finish, or None for no
+            deadline. This allows the deadline of a request to be passed down to the search. If both `timeout` and
+            `deadline` are given, whichever comes first is used.
+        max_nodes: The maximum number of nodes the search may generate, or None for no limit.
+        progress_fn: An optional function that is called on the event loop with the number of nodes generated so far,
+            every `progress_interval` nodes.
+        progress_interval: The number of nodes between calls to `progress_fn`. Defaults to 10000.
+        executor: The `concurrent.futures.ThreadPoolExecutor` to run the search in. Defaults to None, which uses the
+            event loop's default executor.
+        **kwargs: Keyword arguments for the strategy's `search` method.
+
+    Returns:
+        A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`. If the search runs out of time
+        or nodes, its status is `'time_limit'` or `'node_limit'`, as in `solve_batch`.
+    """
+    assert issubclass(strategy, SearchStrategy)
+    loop = asyncio.get_event_loop()
+    if deadline is not None:
+        remaining = deadline - loop.time()
+        timeout = remaining if timeout is None else min(timeout, remaining)
+
+    cancelled = threading.Event()
+    report = None
+    if progress_fn is not None:
+        report = lambda nodes_generated: loop.call_soon_threadsafe(progress_fn, nodes_generated)
+    cooperative = _CooperativeProblem(problem, max_nodes, timeout, cancelled, report, progress_interval)
+
+    def run():
+        start_time = time.perf_counter()
+        try:
+            result = strategy.search(cooperative, **kwargs)
+        except _BudgetExceeded as e:
+            return SearchResult(None, cooperative.nodes_generated, status=e.status,
+                                elapsed_time=time.perf_counter() - start_time)
+        if not isinstance(result, SearchResult):
+            result = SearchResult(result[0], result[1], elapsed_time=time.perf_counter() - start_time)
+        return result
+
+    try:
+        return await loop.run_in_executor(executor, run)
+    except asyncio.CancelledError:
+        cancelled.set()
+        raise
@@ -3,13 +3,22 @@
 Author: Ryan Strauss
 """
 
+import os
+import sys
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 
 
 class Node:
-    """A node represents a single state in a search problem and is used by the graph-based search methods."""
+    """A node represents a single state in a search problem and is used by the graph-based search methods.
 
-    def __init__(self, state, path_cost, estimated_cost=0.0, solution=None):
+    Nodes are compared and hashed by their `key`, which identifies their state. Strategies use the problem's `encode`
+    as the key when the problem implements it, since hashing and comparing codes is much cheaper than hashing and
+    comparing states, and the state itself otherwise.
+    """
+
+    def __init__(self, state, path_cost, estimated_cost=0.0, parent=None, action=None, key=None):
         """Constructs a new node.
 
         Args:
@@ -17,44 +26,377 @@ class Node:
             path_cost: The cost of the path leading to this node.
             estimated_cost: The estimated cost from this node to the solution. This is only relevant to informed
                 search methods. Default to 0.0, for when doing uninformed search.
-            solution: A list of actions that represent the solution for reaching this node. Defaults to None.
+            parent: The node that this node was generated from. Defaults to None, for the root node.
+            action: The action that was taken in `parent` to reach this node. Defaults to None, for the root node.
+            key: The value that identifies `state` in explored sets and frontiers. Defaults to None, in which case the
+                state itself is used.
         """
         self.state = state
         self.path_cost = path_cost
         self.estimated_cost = estimated_cost
         self.estimated_solution_cost = self.path_cost + self.estimated_cost
-        self.solution = solution or []
+        self.parent = parent
+        self.action = action
+        self.key = state if key is None else key
+
+    @property
+    def solution(self):
+        """The list of actions that leads from the root node to this node.
+
+        The list is rebuilt by following parent references, so it should only be requested once a goal is found.
+        """
+        actions = []
+        node = self
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        return actions
 
     def __eq__(self, other):
-        return self.state.__eq__(other.state)
+        return self.key == other.key
 
     def __lt__(self, other):
         return self.estimated_solution_cost < other.estimated_solution_cost
 
     def __hash__(self):
-        return self.state.__hash__()
+        return hash(self.key)
 
-    def expand(self, problem, heuristic_fn=None):
+    def expand(self, problem, heuristic_fn=None, reverse=False, key_fn=None):
         """Expands this node by returning a list of its successors.
 
         Each successor node contains a state that can be reached by taking an action in the current node's state.
+        Forward successors come from the problem's `successors`, which may leave out the successor that leads straight
+        back to this node's parent.
 
         Args:
             problem: The `AbstractProblem` that is under consideration.
-            heuristic_fn: The optional heuristic function being used.
+            heuristic_fn: The optional heuristic function being used. If it has an `incremental` attribute, that is
+                called as `incremental(state, estimated_cost, next_state)` with this node's state and heuristic value
+                to compute the heuristic value of each successor from this node's one. Otherwise, if it has a `batch`
+                attribute, that is called once with the list of successor states and returns their heuristic values.
+            reverse: If True, the node is expanded backwards using the problem's reverse transition model. The
+                returned nodes then contain the states from which this node's state can be reached, and their action
+                is the action that leads from their state to this one. Defaults to False.
+            key_fn: The function that computes the key of each successor's state, as returned by `_state_key_fn`.
+                Defaults to None, in which case states are their own keys.
 
         Returns:
             A list of this node's successors.
         """
+        if reverse:
+            transitions = []
+            for action in problem.get_reverse_actions(self.state):
+                previous_state, step_cost = problem.reverse_transition(self.state, action)
+                transitions.append((action, previous_state, step_cost))
+        else:
+            transitions = problem.successors(self.state, self.action)
+
+        incremental_fn = getattr(heuristic_fn, 'incremental', None)
+        batch_fn = getattr(heuristic_fn, 'batch', None)
+        estimated_costs = None
+        if incremental_fn is None and batch_fn is not None and transitions:
+            estimated_costs = iter(batch_fn([next_state for _, next_state, _ in transitions]))
         successors = []
-        for action in problem.get_actions(self.state):
-            next_state, step_cost = problem.transition(self.state, action)
-            estimated_cost = 0.0 if heuristic_fn is None else heuristic_fn(next_state)
-            successors.append(Node(next_state, self.path_cost + step_cost, estimated_cost, self.solution + [action]))
+        for action, next_state, step_cost in transitions:
+            if heuristic_fn is None:
+                estimated_cost = 0.0
+            elif incremental_fn is not None:
+                estimated_cost = incremental_fn(self.state, self.estimated_cost, next_state)
+            elif estimated_costs is not None:
+                estimated_cost = next(estimated_costs)
+            else:
+                estimated_cost = heuristic_fn(next_state)
+            key = None if key_fn is None else key_fn(next_state)
+            successors.append(Node(next_state, self.path_cost + step_cost, estimated_cost, self, action, key))
 
         return successors
 
 
+class TranspositionTable:
+    """A bounded table that remembers the cheapest path cost with which each state has been reached.
+
+    Depth-first strategies use a transposition table to avoid re-searching states that they have already reached
+    through a different path. Once the table is full, the least recently used state is evicted, so memory stays
+    bounded regardless of the size of the state space.
+    """
+
+    def __init__(self, maxsize):
+        """Constructs a new transposition table.
+
+        Args:
+            maxsize: The maximum number of states that the table will hold.
+        """
+        self.maxsize = maxsize
+        self._table = OrderedDict()
+
+    def __len__(self):
+        return len(self._table)
+
+    def clear(self):
+        """Removes all states from the table."""
+        self._table.clear()
+
+    def should_prune(self, state, path_cost):
+        """Records that a state was reached and reports whether it had already been reached at least as cheaply.
+
+        Args:
+            state: The state that was reached.
+            path_cost: The cost of the path with which `state` was reached.
+
+        Returns:
+            True if `state` is already in the table with a path cost no greater than `path_cost`, in which case it
+            need not be searched again, and False otherwise.
+        """
+        best = self._table.get(state)
+        if best is None or path_cost < best:
+            self._table[state] = path_cost
+            if len(self._table) > self.maxsize:
+                self._table.popitem(last=False)
+        self._table.move_to_end(state)
+        return best is not None and best <= path_cost
+
+
+class SearchObserver:
+    """An observer that receives callbacks as a search progresses.
+
+    Observers can be passed to the strategies that support them in order to monitor a search while it is running,
+    for example to log its progress or export live statistics. This base class ignores every event, so subclasses
+    only need to override the callbacks they are interested in. Passing an observer also makes the search record
+    how its time is split between expanding nodes and maintaining the frontier.
+    """
+
+    def on_expand(self, node, children):
+        """Called after a node has been expanded.
+
+        Args:
+            node: The node that was expanded.
+            children: The list of nodes that were generated from `node`.
+        """
+        pass
+
+    def on_update(self, node):
+        """Called when a cheaper path is found to a state that is already in the frontier.
+
+        Args:
+            node: The node that replaced the frontier's previous node for its state.
+        """
+        pass
+
+    def on_reopen(self, node):
+        """Called when a cheaper path is found to a state that has already been expanded, which is then re-opened.
+
+        Args:
+            node: The node that was put back into the frontier.
+        """
+        pass
+
+    def on_solution(self, node, suboptimality_bound):
+        """Called when an anytime search finds a solution that is better than the ones it found before.
+
+        Args:
+            node: The goal node of the new solution.
+            suboptimality_bound: An upper bound on the ratio between the cost of the new solution and the cost of an
+                optimal one.
+        """
+        pass
+
+    def on_finish(self, result):
+        """Called once the search is over.
+
+        Args:
+            result: The `SearchResult` of the search.
+        """
+        pass
+
+
+class SearchResult:
+    """The outcome of a search, along with statistics about how the search went.
+
+    For compatibility with strategies that return a plain tuple, a result can be unpacked (or indexed) as the 2-tuple
+    `(solution, nodes_generated)`.
+
+    Attributes:
+        solution: A list of actions that represents the solution to the problem, or None if no solution was found.
+        status: Why the search ended. One of `'solved'`, `'unsolvable'` (the search space was exhausted without
+            finding a solution), `'node_limit'`, `'time_limit'` or `'memory_limit'` (the search reached one of its
+            `SearchLimits`), or `'cost_limit'` (a depth-limited search found no solution within its limit but did not
+            exhaust the search space). An anytime search that reaches a limit after finding a solution still reports
+            the limit.
+        nodes_generated: The number of nodes that were generated during the search process.
+        nodes_expanded: The number of nodes that were expanded.
+        max_frontier_size: The largest number of nodes that were in the frontier at once.
+        explored_size: The number of states in the explored set when the search ended.
+        nodes_reopened: The number of expanded states that were put back into the frontier because a cheaper path to
+            them was found.
+        frontier_updates: The number of times a cheaper path was found to a state that was already in the frontier.
+        duplicates: The number of generated nodes that were discarded because their state had already been reached.
+        solution_cost: The path cost of the solution, or None if no solution was found.
+        elapsed_time: The number of seconds the search took.
+        phase_times: If the search was run with an observer, a dictionary with the number of seconds spent expanding
+            nodes (`'expand'`) and on everything else, which is mostly maintaining the frontier and explored set
+            (`'frontier'`). Otherwise None.
+        suboptimality_bound: For searches that do not guarantee an optimal solution, an upper bound on the ratio
+            between the cost of the solution and the cost of an optimal one, if one is known. Otherwise None.
+        iterations: For iterative deepening searches, the number of depth-first iterations that were performed.
+            Otherwise None.
+    """
+
+    def __init__(self, solution, nodes_generated, status=None, nodes_expanded=0, max_frontier_size=0,
+                 explored_size=0, nodes_reopened=0, frontier_updates=0, duplicates=0, solution_cost=None,
+                 elapsed_time=0.0, phase_times=None, suboptimality_bound=None, iterations=None):
+        self.solution = solution
+        self.status = status or ('unsolvable' if solution is None else 'solved')
+        self.nodes_generated = nodes_generated
+        self.nodes_expanded = nodes_expanded
+        self.max_frontier_size = max_frontier_size
+        self.explored_size = explored_size
+        self.nodes_reopened = nodes_reopened
+        self.frontier_updates = frontier_updates
+        self.duplicates = duplicates
+        self.solution_cost = solution_cost
+        self.elapsed_time = elapsed_time
+        self.phase_times = phase_times
+        self.suboptimality_bound = suboptimality_bound
+        self.iterations = iterations
+
+    def __iter__(self):
+        return iter((self.solution, self.nodes_generated))
+
+    def __getitem__(self, index):
+        return (self.solution, self.nodes_generated)[index]
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={value!r}' for name, value in vars(self).items())
+        return f'SearchResult({fields})'
+
+    @property
+    def duplicate_rate(self):
+        """The fraction of generated nodes that were discarded as duplicates."""
+        return self.duplicates / self.nodes_generated if self.nodes_generated else 0.0
+
+
+def _current_memory():
+    """Returns the resident set size of the current process in bytes.
+
+    On platforms without `/proc`, the peak resident set size is returned instead, which is an upper bound. On platforms
+    without the `resource` module, such as Windows, the memory cannot be measured and None is returned.
+    """
+    try:
+        with open('/proc/self/statm') as fp:
+            return int(fp.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class SearchLimits:
+    """Limits on the resources that a search may use.
+
+    A search that reaches any of its limits stops cleanly, returning the best solution it has found so far (if any)
+    and reporting the limit it reached in the `status` of its `SearchResult`.
+    """
+
+    def __init__(self, max_nodes=None, max_time=None, max_memory=None, memory_check_interval=1000):
+        """Constructs a new set of limits.
+
+        Args:
+            max_nodes: The maximum number of nodes that may be generated, or None for no limit.
+            max_time: The maximum number of seconds that the search may run for, or None for no limit.
+            max_memory: The approximate maximum number of bytes of memory that may be used, or None for no limit. This
+                is compared against the resident set size of the whole process, and is not enforced on platforms where
+                that cannot be measured.
+            memory_check_interval: Measuring memory usage is relatively slow, so it is only done once every this many
+                node expansions.
+        """
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.max_memory = max_memory
+        self.memory_check_interval = memory_check_interval
+
+    def start(self):
+        """Starts monitoring a search against these limits.
+
+        Returns:
+            A `LimitMonitor` whose clock starts now.
+        """
+        return LimitMonitor(self)
+
+
+class LimitMonitor:
+    """Checks whether a running search has reached its `SearchLimits`."""
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.deadline = None if limits.max_time is None else time.perf_counter() + limits.max_time
+        self._checks = 0
+
+    def check(self, nodes_generated):
+        """Checks the limits. Searches should call this once per node expansion.
+
+        Args:
+            nodes_generated: The number of nodes that the search has generated so far.
+
+        Returns:
+            The status that the search should stop with if it has reached a limit, and None otherwise.
+        """
+        limits = self.limits
+        if limits.max_nodes is not None and nodes_generated >= limits.max_nodes:
+            return 'node_limit'
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return 'time_limit'
+        if limits.max_memory is not None:
+            self._checks += 1
+            if self._checks % limits.memory_check_interval == 0:
+                memory = _current_memory()
+                if memory is not None and memory >= limits.max_memory:
+                    return 'memory_limit'
+        return None
+
+
+def _state_key_fn(problem):
+    """Returns the function that gives the keys of a problem's states in explored sets and frontiers.
+
+    Args:
+        problem: The `AbstractProblem` instance that is to be solved.
+
+    Returns:
+        The problem's `encode` if it implements one, and None otherwise, in which case states are their own keys.
+    """
+    try:
+        problem.encode(problem.initial_state)
+    except NotImplementedError:
+        return None
+    return problem.encode
+
+
+def _reject_unsolvable(problem, observer=None):
+    """Checks whether a problem is known to be unsolvable before any search is done.
+
+    Args:
+        problem: The `AbstractProblem` instance that is to be solved.
+        observer: An optional `SearchObserver`, which is notified of the result if the problem is rejected.
+
+    Returns:
+        A `SearchResult` with no solution if `problem.is_solvable()` is False, and None otherwise.
+    """
+    if problem.is_solvable():
+        return None
+    result = SearchResult(None, 0)
+    if observer is not None:
+        observer.on_finish(result)
+    return result
+
+
 class SearchStrategy(ABC):
     """The abstract base class that all search strategies inherit from."""
 
@@ -70,5 +412,6 @@ class SearchStrategy(ABC):
             A 2-tuple with:
                 solution: A list of actions that represents the solution to the problem.
                 nodes_generated: The number of nodes that were generated during the search process.
+            Strategies may instead return a `SearchResult`, which unpacks in the same way.
         """
         pass
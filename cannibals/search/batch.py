@@ -0,0 +1,200 @@
+"""Provides a way to solve many problem instances in parallel across a pool of processes.
+
+Author: Ryan Strauss
+"""
+
+import pickle
+import time
+from collections import namedtuple
+
+from cannibals.problems.base import AbstractProblem
+from cannibals.search.base import SearchStrategy
+
+BatchResult = namedtuple('BatchResult', ['index', 'solution', 'nodes_generated', 'wall_time', 'status'])
+BatchResult.__doc__ = """The result of solving a single problem instance in a batch.
+
+Attributes:
+    index: The position of the problem in the list of problems that was given to `solve_batch`.
+    solution: A list of actions that represents the solution to the problem, or None if no solution was found.
+    nodes_generated: The number of nodes that were generated while solving the problem.
+    wall_time: The number of seconds it took to solve the problem.
+    status: One of `'solved'`, `'unsolvable'` (the search finished without finding a solution), `'time_limit'` or
+        `'node_limit'` (the search was stopped because it exceeded its budget). These are the same statuses that a
+        `SearchResult` reports when its search stops at one of its `SearchLimits`.
+"""
+
+
+class _BudgetExceeded(Exception):
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class _BudgetedProblem(AbstractProblem):
+    """Wraps a problem so that any search over it is stopped once it exceeds a time or node budget.
+
+    The budget is checked whenever the search asks for the actions of a state or generates a successor, so it works
+    with every search strategy without the strategies needing to know about it. The optional interfaces of
+    `AbstractProblem` are forwarded explicitly, since `__getattr__` is not consulted for methods that the base class
+    defines.
+    """
+
+    def __init__(self, problem, max_nodes, timeout):
+        super().__init__(problem.initial_state)
+        self.goal_state = problem.goal_state
+        self.batch_actions = problem.batch_actions
+        self.nodes_generated = 0
+        self._problem = problem
+        self._max_nodes = max_nodes
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+
+    def __getattr__(self, name):
+        return getattr(self._problem, name)
+
+    def _check_deadline(self):
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise _BudgetExceeded('time_limit')
+
+    def _count_node(self):
+        self.nodes_generated += 1
+        if self._max_nodes is not None and self.nodes_generated > self._max_nodes:
+            raise _BudgetExceeded('node_limit')
+
+    def get_actions(self, state):
+        self._check_deadline()
+        return self._problem.get_actions(state)
+
+    def goal_test(self, state):
+        return self._problem.goal_test(state)
+
+    def transition(self, state, action):
+        self._count_node()
+        return self._problem.transition(state, action)
+
+    def successors(self, state, parent_action=None):
+        self._check_deadline()
+        successors = self._problem.successors(state, parent_action)
+        for _ in successors:
+            self._count_node()
+        return successors
+
+    def get_reverse_actions(self, state):
+        self._check_deadline()
+        return self._problem.get_reverse_actions(state)
+
+    def reverse_transition(self, state, action):
+        self._count_node()
+        return self._problem.reverse_transition(state, action)
+
+    def is_solvable(self):
+        return self._problem.is_solvable()
+
+    def canonical_key(self):
+        return self._problem.canonical_key()
+
+    def state_space_size(self):
+        return self._problem.state_space_size()
+
+    def rank(self, state):
+        return self._problem.rank(state)
+
+    def unrank(self, rank):
+        return self._problem.unrank(rank)
+
+    def encode(self, state):
+        return self._problem.encode(state)
+
+    def decode(self, code):
+        return self._problem.decode(code)
+
+    def serialized_size(self):
+        return self._problem.serialized_size()
+
+    def serialize(self, state):
+        return self._problem.serialize(state)
+
+    def deserialize(self, data):
+        return self._problem.deserialize(data)
+
+    def batch_successors(self, codes):
+        self._check_deadline()
+        parents, actions, children = self._problem.batch_successors(codes)
+        self.nodes_generated += len(children)
+        if self._max_nodes is not None and self.nodes_generated > self._max_nodes:
+            raise _BudgetExceeded('node_limit')
+        return parents, actions, children
+
+
+def _solve_chunk(chunk, strategy, heuristic_factory, search_kwargs, timeout, max_nodes):
+    """Solves a chunk of `(index, problem)` pairs in a worker process and returns a list of `BatchResult`s."""
+    results = []
+    for index, problem in chunk:
+        start = time.perf_counter()
+        kwargs = dict(search_kwargs)
+        if heuristic_factory is not None:
+            kwargs['heuristic_fn'] = heuristic_factory(problem)
+
+        budgeted = _BudgetedProblem(problem, max_nodes, timeout)
+        try:
+            result = strategy.search(budgeted, **kwargs)
+            solution, nodes_generated = result[0], result[1]
+            status = getattr(result, 'status', None) or ('unsolvable' if solution is None else 'solved')
+        except _BudgetExceeded as e:
+            solution, nodes_generated, status = None, budgeted.nodes_generated, e.status
+
+        results.append(BatchResult(index, solution, nodes_generated, time.perf_counter() - start, status))
+    return results
+
+
+def solve_batch(problems, strategy, heuristic_factory=None, search_kwargs=None, chunksize=1, timeout=None,
+                max_nodes=None, max_workers=None):
+    """Solves a list of problems in parallel using a pool of worker processes.
+
+    Results are yielded as soon as they are available, so they will generally not be in the same order as `problems`.
+
+    Everything that is sent to the workers must be picklable. In particular, the functions returned by
+    `make_heuristic_fn` are not, so heuristics have to be given as a `heuristic_factory` that builds the heuristic
+    function for a problem inside the worker, such as `functools.partial(make_heuristic_fn,
+    heuristic_fn=manhattan_distance)`.
+
+    Args:
+        problems: A list of the `AbstractProblem` instances that are to be solved.
+        strategy: The `SearchStrategy` subclass that will be used to solve each problem.
+        heuristic_factory: An optional picklable function that accepts a problem as the single argument and returns
+            the heuristic function to use for it, which is passed to the strategy as `heuristic_fn`.
+        search_kwargs: An optional dictionary of additional keyword arguments for the strategy's `search` method.
+        chunksize: The number of problems that are sent to a worker at a time. Larger chunks reduce the overhead of
+            communicating with the workers when there are many small problems. Defaults to 1.
+        timeout: The maximum number of seconds to spend on each problem, or None for no limit.
+        max_nodes: The maximum number of nodes to generate for each problem, or None for no limit.
+        max_workers: The number of worker processes. Defaults to the number of processors on the machine.
+
+    Yields:
+        A `BatchResult` for each problem.
+    """
+    # Importing the process pool is relatively slow, so it is only done when it is needed
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    assert issubclass(strategy, SearchStrategy)
+    assert chunksize >= 1
+    search_kwargs = search_kwargs or {}
+    try:
+        pickle.dumps((heuristic_factory, search_kwargs))
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise TypeError('heuristic_factory and search_kwargs must be picklable; heuristic functions should be '
+                        'given as a heuristic_factory rather than as a lambda') from e
+
+    indexed = list(enumerate(problems))
+    chunks = [indexed[i:i + chunksize] for i in range(0, len(indexed), chunksize)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_solve_chunk, chunk, strategy, heuristic_factory, search_kwargs, timeout, max_nodes)
+                   for chunk in chunks]
+        try:
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            # If the caller stops consuming results early, the chunks that have not started are abandoned
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,236 @@
+"""Implementations of bidirectional search strategies.
+
+These strategies search forwards from the initial state and backwards from the goal state at the same time, and stop
+once the two searches meet. They can only be used with problems that declare an explicit `goal_state` and implement
+the reverse transition model of `AbstractProblem`.
+
+Author: Ryan Strauss
+"""
+
+import heapq
+import itertools
+import math
+
+from cannibals.problems.base import AbstractProblem
+from cannibals.search.base import Node, SearchStrategy, _state_key_fn
+
+
+def _check_problem(problem):
+    assert isinstance(problem, AbstractProblem)
+    if problem.goal_state is None:
+        raise ValueError('bidirectional search requires a problem with an explicit goal state')
+
+
+def _join(forward_node, backward_node):
+    """Joins the paths of a forward node and a backward node that contain the same state into a single solution."""
+    solution = forward_node.solution
+    node = backward_node
+    while node.parent is not None:
+        solution.append(node.action)
+        node = node.parent
+    return solution
+
+
+class BidirectionalBreadthFirstSearch(SearchStrategy):
+    """Implementation of bidirectional breadth-first search.
+
+    Two breadth-first searches are run, one forwards from the initial state and one backwards from the goal state,
+    always expanding a whole layer of whichever search has the smaller frontier. When the solution is d steps long,
+    each search only has to reach a depth of about d/2, so O(b^(d/2)) nodes are generated instead of O(b^d).
+
+    As with breadth-first search, the solution has the fewest possible steps.
+    """
+
+    @staticmethod
+    def search(problem):
+        _check_problem(problem)
+        if not problem.is_solvable():
+            return None, 0
+        key_fn = _state_key_fn(problem)
+        forward_root = Node(problem.initial_state, 0, key=None if key_fn is None else key_fn(problem.initial_state))
+        if problem.goal_test(forward_root.state):
+            return forward_root.solution, 1
+        backward_root = Node(problem.goal_state, 0, key=None if key_fn is None else key_fn(problem.goal_state))
+        generated_nodes = 2
+
+        forward_layer, backward_layer = [forward_root], [backward_root]
+        forward_reached = {forward_root.key: forward_root}
+        backward_reached = {backward_root.key: backward_root}
+
+        while forward_layer and backward_layer:
+            reverse = len(backward_layer) < len(forward_layer)
+            if reverse:
+                layer, reached, other_reached = backward_layer, backward_reached, forward_reached
+            else:
+                layer, reached, other_reached = forward_layer, forward_reached, backward_reached
+
+            # The whole layer is expanded even after the searches meet, since a later node in the layer may meet a
+            # shallower node of the other search
+            next_layer = []
+            best = None
+            best_length = math.inf
+            for node in layer:
+                children = node.expand(problem, reverse=reverse, key_fn=key_fn)
+                generated_nodes += len(children)
+                for child in children:
+                    if child.key in reached:
+                        continue
+                    reached[child.key] = child
+                    next_layer.append(child)
+                    other = other_reached.get(child.key)
+                    if other is not None and len(other.solution) < best_length:
+                        best = child, other
+                        best_length = len(other.solution)
+
+            if best is not None:
+                child, other = best
+                forward_node, backward_node = (other, child) if reverse else (child, other)
+                return _join(forward_node, backward_node), generated_nodes
+
+            if reverse:
+                backward_layer = next_layer
+            else:
+                forward_layer = next_layer
+
+        return None, generated_nodes
+
+
+class _OpenList:
+    """The open list of one direction of `BidirectionalAStarSearch`.
+
+    The list needs to provide the minimum priority, f-value and g-value of its nodes, so it keeps a heap for each of
+    them. A dictionary maps the key of each state to its live node, and heap entries for nodes that have since been
+    removed or replaced are discarded lazily.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self._counter = itertools.count()
+        self._heaps = {'priority': [], 'f': [], 'g': []}
+
+    def __contains__(self, key):
+        return key in self.nodes
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def push(self, node):
+        self.nodes[node.key] = node
+        count = next(self._counter)
+        priority = max(node.estimated_solution_cost, 2 * node.path_cost)
+        heapq.heappush(self._heaps['priority'], (priority, node.path_cost, count, node))
+        heapq.heappush(self._heaps['f'], (node.estimated_solution_cost, count, node))
+        heapq.heappush(self._heaps['g'], (node.path_cost, count, node))
+
+    def remove(self, key):
+        del self.nodes[key]
+
+    def _top(self, key):
+        heap = self._heaps[key]
+        while heap and self.nodes.get(heap[0][-1].key) is not heap[0][-1]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def min(self, key):
+        top = self._top(key)
+        return math.inf if top is None else top[0]
+
+    def pop(self):
+        node = self._top('priority')[-1]
+        self.remove(node.key)
+        return node
+
+
+class BidirectionalAStarSearch(SearchStrategy):
+    """Implementation of bidirectional heuristic search using the MM algorithm.
+
+    MM runs an A*-like search in each direction, where a node n is prioritized by max(f(n), 2g(n)). This guarantees
+    that the two searches meet in the middle: neither one expands a node that is more than halfway along an optimal
+    solution. The search stops as soon as the cheapest solution found so far can be proven to be optimal.
+
+    See Holte et al., "Bidirectional Search That Is Guaranteed to Meet in the Middle", AAAI 2016.
+    """
+
+    @staticmethod
+    def search(problem, heuristic_fn=None, reverse_heuristic_fn=None, epsilon=0.0):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved. It must declare a `goal_state` and
+                implement the reverse transition model.
+            heuristic_fn: A function that accepts a state of `problem` as the single argument and returns an estimate
+                of the cost to reach the goal state from that state. If None, no heuristic is used.
+            reverse_heuristic_fn: A function that accepts a state of `problem` as the single argument and returns an
+                estimate of the cost to reach that state from the initial state. If None, no heuristic is used for the
+                backward search. For the sliding tile puzzle, this can be made by passing a puzzle with the initial
+                and goal states swapped to `make_heuristic_fn`.
+            epsilon: The cost of the cheapest action in the problem, which allows the search to stop earlier. Must
+                not be larger than the cost of any action. Defaults to 0.0.
+
+        Returns:
+            A 2-tuple with:
+                solution: A list of actions that represents the solution to the problem.
+                nodes_generated: The number of nodes that were generated during the search process.
+        """
+        _check_problem(problem)
+        if not problem.is_solvable():
+            return None, 0
+        h_forward = 0.0 if heuristic_fn is None else heuristic_fn(problem.initial_state)
+        key_fn = _state_key_fn(problem)
+        forward_root = Node(problem.initial_state, 0, h_forward,
+                            key=None if key_fn is None else key_fn(problem.initial_state))
+        if problem.goal_test(forward_root.state):
+            return forward_root.solution, 1
+        h_backward = 0.0 if reverse_heuristic_fn is None else reverse_heuristic_fn(problem.goal_state)
+        backward_root = Node(problem.goal_state, 0, h_backward,
+                             key=None if key_fn is None else key_fn(problem.goal_state))
+        generated_nodes = 2
+
+        forward_open, backward_open = _OpenList(), _OpenList()
+        forward_open.push(forward_root)
+        backward_open.push(backward_root)
+        forward_closed, backward_closed = {}, {}
+
+        best_cost = math.inf
+        best = None
+
+        while forward_open and backward_open:
+            forward_priority, backward_priority = forward_open.min('priority'), backward_open.min('priority')
+            lower_bound = max(min(forward_priority, backward_priority),
+                              forward_open.min('f'), backward_open.min('f'),
+                              forward_open.min('g') + backward_open.min('g') + epsilon)
+            if best_cost <= lower_bound:
+                break
+
+            reverse = backward_priority < forward_priority
+            if reverse:
+                open_list, closed, other_open = backward_open, backward_closed, forward_open
+                fn = reverse_heuristic_fn
+            else:
+                open_list, closed, other_open = forward_open, forward_closed, backward_open
+                fn = heuristic_fn
+
+            node = open_list.pop()
+            closed[node.key] = node
+            children = node.expand(problem, heuristic_fn=fn, reverse=reverse, key_fn=key_fn)
+            generated_nodes += len(children)
+
+            for child in children:
+                previous = open_list.nodes.get(child.key) or closed.get(child.key)
+                if previous is not None:
+                    if previous.path_cost <= child.path_cost:
+                        continue
+                    if child.key in open_list:
+                        open_list.remove(child.key)
+                    else:
+                        del closed[child.key]
+                open_list.push(child)
+
+                other = other_open.nodes.get(child.key)
+                if other is not None and child.path_cost + other.path_cost < best_cost:
+                    best_cost = child.path_cost + other.path_cost
+                    best = (other, child) if reverse else (child, other)
+
+        if best is None:
+            return None, generated_nodes
+        return _join(*best), generated_nodes
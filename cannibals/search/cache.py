@@ -0,0 +1,143 @@
+"""Provides a cache of solutions that can be wrapped around any search strategy.
+
+Author: Ryan Strauss
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from cannibals.problems.base import AbstractProblem
+from cannibals.search.base import SearchStrategy, SearchResult
+
+# Stands in for a problem that is known to have no solution, since None means that a key is not cached
+_UNSOLVABLE = 'unsolvable'
+
+
+class SolutionCache:
+    """Caches the solutions that a search strategy finds, so that repeated problems are not solved again.
+
+    Problems are looked up by their `canonical_key`, so a cached solution is also reused for any problem that is
+    equivalent to the one it was found for. For the sliding tile puzzle, this includes problems that are rotations or
+    reflections of each other or that only number their tiles differently. Solutions are stored in terms of the
+    canonical problem's actions and translated into the actions of each problem that they are returned for.
+
+    Solutions are kept in memory in a least-recently-used cache and, if a path is given, in an SQLite database, which
+    persists between runs and can be shared by several processes. The database is keyed by the name of the strategy,
+    but not by the arguments it is given, so a separate database file should be used for each configuration of a
+    strategy (e.g. each weight of `WeightedAStarSearch`) whose solutions should not be mixed.
+
+        cache = SolutionCache(AStarSearch, path='solutions.db')
+        result = cache.search(problem, heuristic_fn=heuristic_fn)
+    """
+
+    def __init__(self, strategy, maxsize=1024, path=None):
+        """Constructs a new `SolutionCache`.
+
+        Args:
+            strategy: The `SearchStrategy` subclass that solves the problems that are not in the cache.
+            maxsize: The maximum number of solutions that are kept in memory. Defaults to 1024.
+            path: The path of an SQLite database in which solutions are also stored. Defaults to None, in which case
+                solutions are only kept in memory.
+        """
+        assert issubclass(strategy, SearchStrategy)
+        self.strategy = strategy
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute('CREATE TABLE IF NOT EXISTS solutions '
+                                         '(strategy TEXT, key TEXT, solution TEXT, PRIMARY KEY (strategy, key))')
+
+    def __len__(self):
+        return len(self._memory)
+
+    def close(self):
+        """Closes the database, if there is one. The in-memory cache can still be used afterwards."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def search(self, problem, **kwargs):
+        """Solves a problem, using a cached solution if one is available.
+
+        Problems whose search is stopped by `SearchLimits` are not cached, whereas problems that are found to have no
+        solution are.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved. It must implement `canonical_key`, and its
+                actions must be serializable as JSON if a database is used.
+            **kwargs: Keyword arguments for the strategy's `search` method.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`. A result that comes from
+            the cache has generated no nodes, and its solution cost is recomputed from the problem's transitions.
+        """
+        assert isinstance(problem, AbstractProblem)
+        start_time = time.perf_counter()
+        key, action_map = problem.canonical_key()
+
+        cached = self._get(key)
+        if cached is not None:
+            self.hits += 1
+            if cached == _UNSOLVABLE:
+                return SearchResult(None, 0, elapsed_time=time.perf_counter() - start_time)
+            if action_map is not None:
+                inverse = {canonical: action for action, canonical in action_map.items()}
+                cached = [inverse[action] for action in cached]
+            state, solution_cost = problem.initial_state, 0
+            for action in cached:
+                state, step_cost = problem.transition(state, action)
+                solution_cost += step_cost
+            return SearchResult(cached, 0, solution_cost=solution_cost, elapsed_time=time.perf_counter() - start_time)
+
+        self.misses += 1
+        result = self.strategy.search(problem, **kwargs)
+        if not isinstance(result, SearchResult):
+            result = SearchResult(result[0], result[1], elapsed_time=time.perf_counter() - start_time)
+
+        if result.status == 'solved':
+            solution = result.solution
+            if action_map is not None:
+                solution = [action_map[action] for action in solution]
+            self._put(key, solution)
+        elif result.status == 'unsolvable':
+            self._put(key, _UNSOLVABLE)
+        return result
+
+    def _get(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                return value
+            if self._connection is None:
+                return None
+            row = self._connection.execute('SELECT solution FROM solutions WHERE strategy = ? AND key = ?',
+                                           (self.strategy.__name__, key)).fetchone()
+        if row is None:
+            return None
+        value = json.loads(row[0])
+        self._remember(key, value)
+        return value
+
+    def _put(self, key, value):
+        self._remember(key, value)
+        if self._connection is not None:
+            with self._lock, self._connection:
+                self._connection.execute('INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)',
+                                         (self.strategy.__name__, key, json.dumps(value)))
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
@@ -0,0 +1,326 @@
+"""Implementations of breadth-first search that keep their states in files rather than in memory.
+
+These strategies can only be used with problems that implement the serialization interface of `AbstractProblem`
+(`serialized_size`, `serialize` and `deserialize`), which writes each state as a fixed number of bytes.
+
+Author: Ryan Strauss
+"""
+
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from cannibals.problems.base import AbstractProblem
+from cannibals.search.base import SearchStrategy, SearchResult, _reject_unsolvable
+
+# The action code of the root record, which has no parent
+_ROOT_CODE = 255
+
+# The largest number of files that are merged at once
+_MAX_MERGE_FILES = 64
+
+# The number of records read from a file at a time
+_READ_RECORDS = 4096
+
+
+def _read_records(path, width):
+    """Yields the fixed-width records of a file in order."""
+    with open(path, 'rb') as fp:
+        while True:
+            data = fp.read(width * _READ_RECORDS)
+            if not data:
+                return
+            for i in range(0, len(data), width):
+                yield data[i:i + width]
+
+
+def _unique(records, size):
+    """Yields the records of a sorted stream, skipping those whose state is the same as that of the record before."""
+    previous = None
+    for record in records:
+        state = record[:size]
+        if state != previous:
+            previous = state
+            yield record
+
+
+def _find_record(path, width, state):
+    """Finds the record of a state in a sorted file with a binary search."""
+    with open(path, 'rb') as fp:
+        low, high = 0, os.path.getsize(path) // width
+        while low < high:
+            middle = (low + high) // 2
+            fp.seek(middle * width)
+            if fp.read(width)[:len(state)] < state:
+                low = middle + 1
+            else:
+                high = middle
+        fp.seek(low * width)
+        return fp.read(width)
+
+
+class _LayerWriter:
+    """Writes the sorted runs of the next layer, and merges them into the layer's file once it is complete.
+
+    Records are collected in memory until the buffer is full, at which point they are sorted and written to a run
+    file. Each record is the serialized state, followed by the serialized state it was reached from and the code of the
+    action that reached it, so sorting records sorts them by state.
+    """
+
+    def __init__(self, directory, size, buffer_records):
+        self.directory = directory
+        self.size = size
+        self.width = 2 * size + 1
+        self.buffer_records = buffer_records
+        self.buffer = []
+        self.runs = []
+        self._num_files = 0
+
+    def _new_path(self):
+        self._num_files += 1
+        return os.path.join(self.directory, f'run-{self._num_files}')
+
+    def _write_run(self, records):
+        path = self._new_path()
+        with open(path, 'wb') as fp:
+            fp.writelines(_unique(records, self.size))
+        self.runs.append(path)
+
+    def add(self, record):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.buffer_records:
+            self.buffer.sort()
+            self._write_run(self.buffer)
+            self.buffer = []
+
+    def merge(self, visited_path, layer_path, new_visited_path, goal_fn):
+        """Merges the runs into the file of the next layer, removing the states that were visited before.
+
+        The runs are merged in a single streaming pass alongside the sorted file of visited states, which is rewritten
+        with the new states added to it. If there are too many runs to open at once, they are first merged in groups.
+
+        Args:
+            visited_path: The file of the sorted states that were visited in earlier layers.
+            layer_path: The file to write the records of the new layer to.
+            new_visited_path: The file to write the sorted states of the earlier layers and the new layer to.
+            goal_fn: A function that tells whether a serialized state is a goal.
+
+        Returns:
+            A 2-tuple with the number of states in the new layer and the record of a goal in it, or None.
+        """
+        if self.buffer:
+            self.buffer.sort()
+            self._write_run(self.buffer)
+            self.buffer = []
+        while len(self.runs) > _MAX_MERGE_FILES:
+            groups = [self.runs[i:i + _MAX_MERGE_FILES] for i in range(0, len(self.runs), _MAX_MERGE_FILES)]
+            self.runs = []
+            for group in groups:
+                self._write_run(heapq.merge(*(_read_records(run, self.width) for run in group)))
+                for run in group:
+                    os.remove(run)
+
+        size = self.size
+        records = _unique(heapq.merge(*(_read_records(run, self.width) for run in self.runs)), size)
+        visited = _read_records(visited_path, size)
+        current = next(visited, None)
+        count = 0
+        goal = None
+        with open(layer_path, 'wb') as layer_fp, open(new_visited_path, 'wb') as visited_fp:
+            for record in records:
+                state = record[:size]
+                while current is not None and current < state:
+                    visited_fp.write(current)
+                    current = next(visited, None)
+                if current == state:
+                    continue
+                visited_fp.write(state)
+                layer_fp.write(record)
+                count += 1
+                if goal is None and goal_fn(state):
+                    goal = record
+            while current is not None:
+                visited_fp.write(current)
+                current = next(visited, None)
+
+        for run in self.runs:
+            os.remove(run)
+        self.runs = []
+        return count, goal
+
+
+def _external_breadth_first_search(problem, directory, buffer_bytes, find_goal, monitor=None):
+    """Runs a breadth-first search with delayed duplicate detection, one layer at a time.
+
+    The states of each layer are read from its file and expanded, and their successors are written to sorted runs.
+    Duplicates are not looked for as successors are generated, but once the layer is complete, by merging the runs
+    with the sorted file of every state visited so far. Only the buffer of the runs is held in memory, so the size of
+    the state space is limited by the disk rather than the memory.
+
+    Args:
+        problem: The `AbstractProblem` to search. It must implement the serialization interface.
+        directory: The directory in which to put the search's files, which are removed when it returns.
+        buffer_bytes: The approximate amount of memory used to buffer successors before they are written to disk.
+        find_goal: Whether to stop at the first layer that contains a goal and return a path to it.
+        monitor: An optional `LimitMonitor`, which is checked before each node is expanded.
+
+    Returns:
+        A 6-tuple with:
+            solution: The actions that reach the goal, or None if no goal was found or `find_goal` is False.
+            layer_sizes: A list with the number of states in each layer that was generated.
+            nodes_generated: The number of nodes that were generated.
+            nodes_expanded: The number of nodes that were expanded.
+            explored_size: The number of distinct states that were visited.
+            status: The limit that stopped the search, or None.
+    """
+    size = problem.serialized_size()
+    width = 2 * size + 1
+    # Each buffered record is a `bytes` object and a pointer to it in the buffer's list
+    buffer_records = max(1, buffer_bytes // (sys.getsizeof(bytes(width)) + 8))
+
+    if problem.goal_state is not None:
+        goal_bytes = problem.serialize(problem.goal_state)
+        goal_fn = goal_bytes.__eq__
+    else:
+        goal_fn = lambda data: problem.goal_test(problem.deserialize(data))
+
+    workdir = tempfile.mkdtemp(prefix='cannibals-', dir=directory)
+    try:
+        root = problem.serialize(problem.initial_state)
+        layer_paths = [os.path.join(workdir, 'layer-0')]
+        visited_path = os.path.join(workdir, 'visited-0')
+        with open(layer_paths[0], 'wb') as fp:
+            fp.write(root + bytes(size) + bytes((_ROOT_CODE,)))
+        with open(visited_path, 'wb') as fp:
+            fp.write(root)
+
+        actions, codes = [], {}
+        layer_sizes = [1]
+        generated_nodes = explored_size = 1
+        expanded_nodes = 0
+        goal = root + bytes(size) + bytes((_ROOT_CODE,)) if find_goal and goal_fn(root) else None
+        status = None
+
+        while goal is None and layer_sizes[-1]:
+            writer = _LayerWriter(workdir, size, buffer_records)
+            for record in _read_records(layer_paths[-1], width):
+                if monitor is not None:
+                    status = monitor.check(generated_nodes)
+                    if status is not None:
+                        break
+                state = record[:size]
+                parent_action = None if record[-1] == _ROOT_CODE else actions[record[-1]]
+                for action, child, _ in problem.successors(problem.deserialize(state), parent_action):
+                    code = codes.get(action)
+                    if code is None:
+                        if len(actions) == _ROOT_CODE:
+                            raise ValueError('external search supports at most 255 distinct actions')
+                        code = codes[action] = len(actions)
+                        actions.append(action)
+                    writer.add(problem.serialize(child) + state + bytes((code,)))
+                    generated_nodes += 1
+                expanded_nodes += 1
+            if status is not None:
+                for run in writer.runs:
+                    os.remove(run)
+                break
+
+            depth = len(layer_paths)
+            layer_paths.append(os.path.join(workdir, f'layer-{depth}'))
+            new_visited_path = os.path.join(workdir, f'visited-{depth}')
+            count, goal = writer.merge(visited_path, layer_paths[-1], new_visited_path,
+                                       goal_fn if find_goal else lambda data: False)
+            os.remove(visited_path)
+            visited_path = new_visited_path
+            layer_sizes.append(count)
+            explored_size += count
+            # Earlier layers are only needed to rebuild the path to a goal
+            if not find_goal:
+                os.remove(layer_paths[-2])
+
+        solution = None
+        if goal is not None:
+            solution = []
+            record = goal
+            for path in reversed(layer_paths[:-1]):
+                solution.append(actions[record[-1]])
+                record = _find_record(path, width, record[size:2 * size])
+            solution.reverse()
+
+        return solution, layer_sizes, generated_nodes, expanded_nodes, explored_size, status
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def external_breadth_first_layers(problem, directory=None, buffer_bytes=64 * 2 ** 20):
+    """Counts the states at each distance from the initial state, keeping the states on disk.
+
+    This enumerates the whole reachable state space, which is useful for analysing problems whose state spaces are too
+    large to hold in memory, such as finding the largest distance from the initial state.
+
+    Args:
+        problem: The `AbstractProblem` to search. It must implement the serialization interface.
+        directory: The directory in which to put temporary files. Defaults to the system's temporary directory.
+        buffer_bytes: The approximate amount of memory used to buffer successors before they are written to disk.
+            Defaults to 64 MiB.
+
+    Returns:
+        A list whose i-th element is the number of states that are reached with i actions and no fewer.
+    """
+    assert isinstance(problem, AbstractProblem)
+    _, layer_sizes, _, _, _, _ = _external_breadth_first_search(problem, directory, buffer_bytes, find_goal=False)
+    return layer_sizes[:-1]
+
+
+class ExternalBreadthFirstSearch(SearchStrategy):
+    """Implementation of breadth-first search that keeps the layers of the search on disk.
+
+    Each layer of the search is stored in a file of serialized states, sorted by state. Successors are buffered in
+    memory, up to a configurable size, and written to sorted runs, which are merged once the layer is complete. The
+    merge removes duplicates within the layer and, by streaming through the sorted file of every state visited so far,
+    those that were reached in earlier layers. This is known as delayed duplicate detection, and allows state spaces
+    that do not fit in memory to be searched, at the cost of reading and writing the visited states once per layer.
+
+    The problem must implement the serialization interface of `AbstractProblem`, and every action must have a step
+    cost of one. The files are kept in a temporary directory, which is removed when the search returns.
+
+    See Korf, "Delayed Duplicate Detection: Extended Abstract", IJCAI, 2003.
+    """
+
+    @staticmethod
+    def search(problem, directory=None, buffer_bytes=64 * 2 ** 20, limits=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            directory: The directory in which to put temporary files. Defaults to the system's temporary directory.
+            buffer_bytes: The approximate amount of memory used to buffer successors before they are written to disk.
+                Defaults to 64 MiB.
+            limits: Optional `SearchLimits` that bound the resources the search may use. Memory limits count only
+                the memory of the process, not the files on disk.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
+        """
+        assert isinstance(problem, AbstractProblem)
+        rejected = _reject_unsolvable(problem)
+        if rejected is not None:
+            return rejected
+        start_time = time.perf_counter()
+        monitor = None if limits is None else limits.start()
+        solution, layer_sizes, generated_nodes, expanded_nodes, explored_size, status = \
+            _external_breadth_first_search(problem, directory, buffer_bytes, find_goal=True, monitor=monitor)
+
+        return SearchResult(
+            solution=solution,
+            nodes_generated=generated_nodes,
+            status=status,
+            nodes_expanded=expanded_nodes,
+            max_frontier_size=max(layer_sizes),
+            explored_size=explored_size,
+            solution_cost=None if solution is None else len(solution),
+            elapsed_time=time.perf_counter() - start_time
+        )
@@ -4,6 +4,8 @@ Author: Ryan Strauss
 """
 
 import heapq
+import itertools
+import operator
 from abc import ABC, abstractmethod
 from collections import deque
 
@@ -12,15 +14,18 @@ class Frontier(ABC):
     """The abstract base class representing a frontier.
 
     A frontier is the collection of nodes that are currently under consideration for being visited next by the
-    search algorithm.
+    search algorithm. Membership is determined by the nodes' keys.
     """
 
     def __init__(self, data):
         self._data = data
-        self._hash_table = set(data)
+        self._hash_table = {element.key for element in data}
 
     def __contains__(self, item):
-        return self._hash_table.__contains__(item)
+        return item.key in self._hash_table
+
+    def __iter__(self):
+        return iter(self._data)
 
     def __len__(self):
         return len(self._data)
@@ -55,7 +60,7 @@ class Frontier(ABC):
         Returns:
             True iff the frontier is empty and False otherwise.
         """
-        return len(self._data) == 0
+        return len(self) == 0
 
 
 class FIFOFrontier(Frontier):
@@ -69,11 +74,11 @@ class FIFOFrontier(Frontier):
 
     def push(self, element):
         self._data.append(element)
-        self._hash_table.add(element)
+        self._hash_table.add(element.key)
 
     def pop(self):
         removed = self._data.popleft()
-        self._hash_table.remove(removed)
+        self._hash_table.remove(removed.key)
         return removed
 
 
@@ -88,11 +93,11 @@ class LIFOFrontier(Frontier):
 
     def push(self, element):
         self._data.append(element)
-        self._hash_table.add(element)
+        self._hash_table.add(element.key)
 
     def pop(self):
         removed = self._data.pop()
-        self._hash_table.remove(removed)
+        self._hash_table.remove(removed.key)
         return removed
 
 
@@ -100,47 +105,161 @@ class PriorityFrontier(Frontier):
     """A frontier that used a priority queue to determine ordering.
 
     This type of frontier is used by uniform cost search as well as A* search.
+
+    The queue is a binary heap with lazy deletion. A dictionary maps the key of each state in the frontier to the best
+    node known for it; when a cheaper path to a state is found, a new entry is pushed and the old one is left in the
+    heap to be discarded when it is popped. Ties in priority are broken in favor of the node with the higher path cost
+    (i.e. the one closer to the goal), and then in insertion order.
     """
 
-    def __init__(self, data):
-        super().__init__(data)
+    def __init__(self, data, priority_fn=None):
+        """Constructs a new priority frontier.
+
+        Args:
+            data: The initial nodes of the frontier.
+            priority_fn: An optional function that accepts a node and returns its priority, where lower values are
+                popped first. Defaults to the node's estimated solution cost.
+        """
+        self._counter = itertools.count()
+        self._priority_fn = priority_fn or operator.attrgetter('estimated_solution_cost')
+        super().__init__([])
+        self._hash_table = {}
+        for element in data:
+            if element.key not in self._hash_table or element.path_cost < self._hash_table[element.key].path_cost:
+                self._hash_table[element.key] = element
+        self._data = [self._make_entry(element) for element in self._hash_table.values()]
         heapq.heapify(self._data)
 
+    def __iter__(self):
+        return iter(self._hash_table.values())
+
+    def __len__(self):
+        return len(self._hash_table)
+
+    def __str__(self):
+        return str(list(self._hash_table.values()))
+
+    def _make_entry(self, element):
+        return self._priority_fn(element), -element.path_cost, next(self._counter), element
+
     def push(self, element):
-        heapq.heappush(self._data, element)
-        self._hash_table.add(element)
+        heapq.heappush(self._data, self._make_entry(element))
+        self._hash_table[element.key] = element
 
     def pop(self):
-        removed = heapq.heappop(self._data)
-        self._hash_table.remove(removed)
-        return removed
+        while True:
+            removed = heapq.heappop(self._data)[-1]
+            # Entries that have been superseded by a cheaper node for the same state are skipped
+            if self._hash_table.get(removed.key) is removed:
+                del self._hash_table[removed.key]
+                return removed
 
     def maybe_update(self, element):
         """Possibly updates the priority of a given node in the queue.
 
         It is possible for two nodes to contain the same state but have different estimated solution costs (which
         correspond to the priority in the queue). This method accepts a node whose state is also represented by
-        a node that is already in the frontier. The method will then check to see if the new node has a higher
-        priority (i.e. lower estimated solution cost). If so, it will replace the preexisting node in the frontier with
-        the better one. If not, the frontier will remain unchanged.
+        a node that is already in the frontier. The method will then check to see if the new node has a lower path
+        cost. If so, it will replace the preexisting node in the frontier with the better one. If not, the frontier
+        will remain unchanged.
+
+        This runs in O(log n) time, since the outdated entry is not removed from the heap but simply ignored once
+        it is popped.
 
         Args:
             element: The node that might get updated. It is assumed that a node containing this node's state is
                 already in the frontier.
 
         Returns:
-            None.
+            True if the frontier was updated and False otherwise.
         """
-        # Get index for outdated version of element in the queue
-        index = self._data.index(element)
-        # The the version already in the queue has a lower priority, we can stop
-        if self._data[index] < element:
-            return
-        # Remove the outdated version from the hash table
-        self._hash_table.remove(self._data[index])
-        # Update element in the queue
-        self._data[index] = element
-        # Add it back to the hash table
-        self._hash_table.add(element)
-        # Restore the heap property
-        heapq.heapify(self._data)
+        # If the version already in the queue is at least as cheap, we can stop
+        if self._hash_table[element.key].path_cost <= element.path_cost:
+            return False
+        self.push(element)
+        return True
+
+
+class FocalFrontier(Frontier):
+    """A frontier for focal search, which trades solution quality for speed within a guaranteed bound.
+
+    Let f_min be the smallest estimated solution cost of any node in the frontier. The focal list contains every node
+    whose estimated solution cost is at most `weight * f_min`, and nodes are popped from the focal list in order of a
+    secondary priority, which does not need to be admissible (by default, the estimated cost to the goal h(n)).
+
+    Nodes are kept in three heaps with lazy deletion: one ordered by estimated solution cost, which provides f_min;
+    one holding the nodes that have not yet entered the focal list, also ordered by estimated solution cost; and the
+    focal list itself, ordered by the secondary priority. Since f_min never decreases when the heuristic is consistent,
+    nodes only ever move into the focal list.
+    """
+
+    def __init__(self, data, weight, focal_priority_fn=None):
+        """Constructs a new focal frontier.
+
+        Args:
+            data: The initial nodes of the frontier.
+            weight: The suboptimality factor, which must be at least 1.
+            focal_priority_fn: An optional function that accepts a node and returns its priority within the focal
+                list, where lower values are popped first. Defaults to the node's estimated cost to the goal.
+        """
+        assert weight >= 1.0
+        self.weight = weight
+        self._focal_priority_fn = focal_priority_fn or operator.attrgetter('estimated_cost')
+        self._counter = itertools.count()
+        self._pending = []
+        self._focal = []
+        super().__init__([])
+        self._hash_table = {}
+        for element in data:
+            if element.key not in self._hash_table or element.path_cost < self._hash_table[element.key].path_cost:
+                self.push(element)
+
+    def __iter__(self):
+        return iter(self._hash_table.values())
+
+    def __len__(self):
+        return len(self._hash_table)
+
+    def __str__(self):
+        return str(list(self._hash_table.values()))
+
+    def _is_live(self, entry):
+        return self._hash_table.get(entry[-1].key) is entry[-1]
+
+    def push(self, element):
+        entry = element.estimated_solution_cost, -element.path_cost, next(self._counter), element
+        heapq.heappush(self._data, entry)
+        heapq.heappush(self._pending, entry)
+        self._hash_table[element.key] = element
+
+    def pop(self):
+        while not self._is_live(self._data[0]):
+            heapq.heappop(self._data)
+        threshold = self.weight * self._data[0][0]
+
+        while self._pending and self._pending[0][0] <= threshold:
+            entry = heapq.heappop(self._pending)
+            if self._is_live(entry):
+                node = entry[-1]
+                heapq.heappush(self._focal, (self._focal_priority_fn(node), entry[0], entry[2], node))
+
+        while True:
+            removed = heapq.heappop(self._focal)[-1]
+            if self._hash_table.get(removed.key) is removed:
+                del self._hash_table[removed.key]
+                return removed
+
+    def maybe_update(self, element):
+        """Possibly replaces the node in the frontier that has the same state as a given node.
+
+        Args:
+            element: The node that might get updated. It is assumed that a node containing this node's state is
+                already in the frontier.
+
+        Returns:
+            True if the frontier was updated and False otherwise.
+        """
+        if self._hash_table[element.key].path_cost <= element.path_cost:
+            return False
+        self.push(element)
+        return True
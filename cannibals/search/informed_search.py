@@ -3,9 +3,231 @@
 Author: Ryan Strauss
 """
 
+import functools
+import math
+import operator
+import time
+
 from cannibals.problems import AbstractProblem
-from cannibals.search.base import SearchStrategy, Node
-from cannibals.search.frontiers import PriorityFrontier
+from cannibals.search.base import SearchStrategy, Node, TranspositionTable, SearchResult, _reject_unsolvable, \
+    _state_key_fn
+from cannibals.search.frontiers import PriorityFrontier, FocalFrontier
+
+
+def memoize_heuristic(heuristic_fn, maxsize=2 ** 16):
+    """Wraps a heuristic function so that its values are cached.
+
+    The cache is keyed on the state (and therefore on its hash) and evicts the least recently used states once it
+    grows past `maxsize` entries. This is useful for expensive heuristics, since the same state is frequently reached
+    through several different paths.
+
+    The `incremental` and `batch` attributes of `heuristic_fn`, if it has them, are kept on the returned function, so
+    that the search strategies still use them. They are not cached, since they are already cheap per state.
+
+    Args:
+        heuristic_fn: The heuristic function to wrap. It must accept a single state as its argument.
+        maxsize: The maximum number of heuristic values that are kept. If None, the cache grows without bound.
+
+    Returns:
+        A function with the same behavior as `heuristic_fn` that caches its results.
+    """
+    memoized = functools.lru_cache(maxsize=maxsize)(heuristic_fn)
+    for name in ('incremental', 'batch'):
+        if hasattr(heuristic_fn, name):
+            setattr(memoized, name, getattr(heuristic_fn, name))
+    return memoized
+
+
+def _evaluate_batch(nodes, batch_fn):
+    """Sets the heuristic values of nodes that were generated without a heuristic, with a single call to `batch_fn`."""
+    if nodes:
+        for node, estimated_cost in zip(nodes, batch_fn([node.state for node in nodes])):
+            node.estimated_cost = estimated_cost
+            node.estimated_solution_cost = node.path_cost + estimated_cost
+
+
+def _pop_batch(problem, frontier, explored, batch_size):
+    """Pops up to `batch_size` nodes from the frontier to be expanded together, adding them to the explored set.
+
+    A goal is only returned if it is the first node that is popped, since the nodes that were popped before it may
+    lead to a cheaper path to it. Otherwise, it is put back into the frontier and ends the batch.
+
+    Returns:
+        A 2-tuple with the list of nodes to expand and the goal node that was found, or None.
+    """
+    nodes = []
+    while len(nodes) < batch_size and not frontier.empty():
+        node = frontier.pop()
+        if problem.goal_test(node.state):
+            if nodes:
+                frontier.push(node)
+                break
+            return nodes, node
+        explored[node.key] = node.path_cost
+        nodes.append(node)
+    return nodes, None
+
+
+def _anytime_suboptimality_bound(frontier, incumbent):
+    """Bounds the ratio between the cost of the best solution found by an anytime search and the optimal cost."""
+    # Every solution that is better than the incumbent must pass through a node in the frontier
+    lower_bound = min((node.estimated_solution_cost for node in frontier), default=incumbent.path_cost)
+    lower_bound = min(lower_bound, incumbent.path_cost)
+    return 1.0 if incumbent.path_cost == lower_bound else incumbent.path_cost / lower_bound
+
+
+def _best_first_search(problem, make_frontier, heuristic_fn=None, heuristic_cache_size=None, reopen=True,
+                       observer=None, limits=None, suboptimality_bound=None, expansion_batch_size=1, anytime=False):
+    """Performs a best-first graph search.
+
+    This is the loop shared by A* and its variants, which differ only in the order in which their frontier returns
+    nodes, in whether they re-open nodes and in whether they stop at the first solution.
+
+    Args:
+        problem: The `AbstractProblem` instance that is to be solved.
+        make_frontier: A function that accepts a list of initial nodes and returns the frontier to use, such as a
+            `PriorityFrontier` with a particular priority function.
+        heuristic_fn: The optional heuristic function being used.
+        heuristic_cache_size: If given, heuristic values are memoized in a least-recently-used cache holding at most
+            this many states.
+        reopen: Whether an expanded state is put back into the frontier when a cheaper path to it is found.
+        observer: An optional `SearchObserver` that is notified as the search progresses.
+        limits: Optional `SearchLimits` that bound the resources the search may use.
+        suboptimality_bound: The bound on the cost of the solution relative to an optimal one that the strategy
+            guarantees, which is reported in the result if a solution is found.
+        expansion_batch_size: If `heuristic_fn` has a `batch` attribute, up to this many nodes are popped from the
+            frontier and expanded together, and the heuristic values of all of their successors are computed with a
+            single call to `batch`. The nodes after the first are not necessarily the best in the frontier by the
+            time they are expanded, so this should only be used with `reopen`. Defaults to 1.
+        anytime: If True, the search does not stop at the first goal. Goals are detected when they are generated and
+            kept as the incumbent solution, which `observer.on_solution` is told about whenever it improves, and nodes
+            whose g(n) + h(n) is no better than the incumbent are pruned. The search ends once the frontier is empty
+            or a limit is reached, and `suboptimality_bound` is ignored in favour of a bound computed from the
+            frontier. Defaults to False.
+
+    Returns:
+        A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
+    """
+    assert isinstance(problem, AbstractProblem)
+    rejected = _reject_unsolvable(problem, observer)
+    if rejected is not None:
+        return rejected
+    start_time = time.perf_counter()
+    if heuristic_fn is not None and heuristic_cache_size:
+        heuristic_fn = memoize_heuristic(heuristic_fn, heuristic_cache_size)
+
+    estimated_cost = 0.0 if heuristic_fn is None else heuristic_fn(problem.initial_state)
+    key_fn = _state_key_fn(problem)
+    node = Node(problem.initial_state, 0, estimated_cost, key=None if key_fn is None else key_fn(problem.initial_state))
+    generated_nodes = 1
+    expanded_nodes = reopened_nodes = frontier_updates = duplicates = 0
+    expand_time = 0.0
+
+    frontier = make_frontier([node])
+    max_frontier_size = 1
+    # Maps each expanded state to the cost of the cheapest path with which it was expanded
+    explored = {}
+    goal = None
+    # The best solution found so far by an anytime search
+    incumbent = node if anytime and problem.goal_test(node.state) else None
+    monitor = None if limits is None else limits.start()
+    status = None
+
+    batch_fn = getattr(heuristic_fn, 'batch', None)
+    if batch_fn is None or anytime:
+        expansion_batch_size = 1
+
+    while not frontier.empty():
+        if monitor is not None:
+            status = monitor.check(generated_nodes)
+            if status is not None:
+                break
+
+        if expansion_batch_size == 1:
+            node = frontier.pop()
+            if anytime:
+                if incumbent is not None and node.estimated_solution_cost >= incumbent.path_cost:
+                    continue
+            elif problem.goal_test(node.state):
+                goal = node
+                break
+            explored[node.key] = node.path_cost
+            nodes = [node]
+        else:
+            nodes, goal = _pop_batch(problem, frontier, explored, expansion_batch_size)
+            if goal is not None:
+                break
+
+        tick = time.perf_counter() if observer is not None else 0.0
+        if expansion_batch_size == 1:
+            expansions = [node.expand(problem, heuristic_fn=heuristic_fn, key_fn=key_fn)]
+        else:
+            expansions = [node.expand(problem, key_fn=key_fn) for node in nodes]
+            _evaluate_batch([child for children in expansions for child in children], batch_fn)
+        if observer is not None:
+            expand_time += time.perf_counter() - tick
+            for node, children in zip(nodes, expansions):
+                observer.on_expand(node, children)
+
+        for children in expansions:
+            generated_nodes += len(children)
+            expanded_nodes += 1
+            for child in children:
+                if anytime:
+                    if incumbent is not None and child.estimated_solution_cost >= incumbent.path_cost:
+                        continue
+                    # Goals are detected when they are generated, so that improved solutions are reported as early as
+                    # possible
+                    if problem.goal_test(child.state):
+                        incumbent = child
+                        if observer is not None:
+                            observer.on_solution(child, _anytime_suboptimality_bound(frontier, incumbent))
+                        continue
+                if child in frontier:
+                    if frontier.maybe_update(child):
+                        frontier_updates += 1
+                        if observer is not None:
+                            observer.on_update(child)
+                    else:
+                        duplicates += 1
+                elif child.key in explored:
+                    if reopen and child.path_cost < explored[child.key]:
+                        del explored[child.key]
+                        frontier.push(child)
+                        reopened_nodes += 1
+                        if observer is not None:
+                            observer.on_reopen(child)
+                    else:
+                        duplicates += 1
+                else:
+                    frontier.push(child)
+
+        if len(frontier) > max_frontier_size:
+            max_frontier_size = len(frontier)
+
+    if anytime:
+        goal = incumbent
+        suboptimality_bound = None if incumbent is None else _anytime_suboptimality_bound(frontier, incumbent)
+
+    elapsed_time = time.perf_counter() - start_time
+    result = SearchResult(
+        solution=None if goal is None else goal.solution,
+        nodes_generated=generated_nodes,
+        status=status,
+        nodes_expanded=expanded_nodes,
+        max_frontier_size=max_frontier_size,
+        explored_size=len(explored),
+        nodes_reopened=reopened_nodes,
+        frontier_updates=frontier_updates,
+        duplicates=duplicates,
+        solution_cost=None if goal is None else goal.path_cost,
+        elapsed_time=elapsed_time,
+        phase_times=None if observer is None else {'expand': expand_time, 'frontier': elapsed_time - expand_time},
+        suboptimality_bound=None if goal is None else suboptimality_bound
+    )
+    if observer is not None:
+        observer.on_finish(result)
+    return result
 
 
 class AStarSearch(SearchStrategy):
@@ -17,44 +239,303 @@ class AStarSearch(SearchStrategy):
     """
 
     @staticmethod
-    def search(problem, heuristic_fn=None):
+    def search(problem, heuristic_fn=None, heuristic_cache_size=None, observer=None, limits=None,
+               expansion_batch_size=1):
         """Attempts to solve the given problem by performing a search over the state space.
 
+        Nodes are re-opened if a cheaper path to them is found after they have been expanded, so the solution is
+        optimal for any admissible heuristic, even an inconsistent one.
+
+        Heuristic functions with a `batch` attribute, such as those made by `make_heuristic_fn` with `batch=True`,
+        are called once per expansion with all of the successors, or once per `expansion_batch_size` expansions.
+        Expanding several nodes at a time may expand nodes that A* would not have, but it lets heuristics that are
+        evaluated with NumPy or a learned model amortize the overhead of each call.
+
         Args:
             problem: The `AbstractProblem` instance that is to be solved.
             heuristic_fn: A function that accepts a state of `problem` as the single argument and returns an estimate
                 of the cost to reach the goal from that state. If None, no heuristic is used and this becomes uniform
                 cost search.
+            heuristic_cache_size: If given, heuristic values are memoized in a least-recently-used cache holding at
+                most this many states. See `memoize_heuristic`. Defaults to None, which disables the cache.
+            observer: An optional `SearchObserver` that is notified as the search progresses.
+            limits: Optional `SearchLimits` that bound the resources the search may use.
+            expansion_batch_size: The number of nodes that are expanded together when `heuristic_fn` has a `batch`
+                attribute. Defaults to 1, which only batches the successors of each expansion.
 
         Returns:
-            A 2-tuple with:
-                solution: A list of actions that represents the solution to the problem.
-                nodes_generated: The number of nodes that were generated during the search process.
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
         """
-        assert isinstance(problem, AbstractProblem)
-        node = Node(problem.initial_state, 0)
-        generated_nodes = 1
+        return _best_first_search(problem, PriorityFrontier, heuristic_fn=heuristic_fn,
+                                  heuristic_cache_size=heuristic_cache_size, observer=observer, limits=limits,
+                                  expansion_batch_size=expansion_batch_size)
 
-        if problem.goal_test(node.state):
-            return node.solution
 
-        frontier = PriorityFrontier([node])
-        explored = set()
-        solution = None
+class WeightedAStarSearch(SearchStrategy):
+    """Implementation of weighted A* search.
 
-        while not frontier.empty():
-            node = frontier.pop()
-            if problem.goal_test(node.state):
-                solution = node.solution
-                break
+    Weighted A* evaluates nodes by g(n) + w * h(n) for a weight w >= 1. Inflating the heuristic makes the search
+    greedier, so it usually expands far fewer nodes than A*. With an admissible and consistent heuristic, the cost of
+    the solution is at most w times the optimal cost.
+    """
 
-            explored.add(node)
-            children = node.expand(problem)
-            generated_nodes += len(children)
-            for child in node.expand(problem, heuristic_fn=heuristic_fn):
-                if not (child in explored or child in frontier):
-                    frontier.push(child)
-                elif child in frontier:
-                    frontier.maybe_update(child)
+    @staticmethod
+    def search(problem, heuristic_fn=None, weight=2.0, reopen=False, heuristic_cache_size=None, observer=None,
+               limits=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            heuristic_fn: A function that accepts a state of `problem` as the single argument and returns an estimate
+                of the cost to reach the goal from that state. If None, no heuristic is used.
+            weight: The weight w of the heuristic. Defaults to 2.0.
+            reopen: Whether expanded nodes are re-opened when a cheaper path to them is found. This is not needed for
+                the bound to hold and is disabled by default, since it costs expansions.
+            heuristic_cache_size: If given, heuristic values are memoized in a least-recently-used cache holding at
+                most this many states. See `memoize_heuristic`. Defaults to None, which disables the cache.
+            observer: An optional `SearchObserver` that is notified as the search progresses.
+            limits: Optional `SearchLimits` that bound the resources the search may use.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`. Its `suboptimality_bound`
+            is `weight`.
+        """
+        assert weight >= 1.0
+        make_frontier = functools.partial(PriorityFrontier,
+                                          priority_fn=lambda node: node.path_cost + weight * node.estimated_cost)
+        return _best_first_search(problem, make_frontier, heuristic_fn=heuristic_fn,
+                                  heuristic_cache_size=heuristic_cache_size, reopen=reopen, observer=observer,
+                                  limits=limits, suboptimality_bound=weight)
+
+
+class GreedyBestFirstSearch(SearchStrategy):
+    """Implementation of greedy best-first search.
+
+    Greedy best-first search expands the node that appears to be closest to the goal, evaluating nodes by the
+    heuristic h(n) alone. It is often very fast, but gives no guarantee on the cost of the solution it finds.
+    """
+
+    @staticmethod
+    def search(problem, heuristic_fn, heuristic_cache_size=None, observer=None, limits=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            heuristic_fn: A function that accepts a state of `problem` as the single argument and returns an estimate
+                of the cost to reach the goal from that state.
+            heuristic_cache_size: If given, heuristic values are memoized in a least-recently-used cache holding at
+                most this many states. See `memoize_heuristic`. Defaults to None, which disables the cache.
+            observer: An optional `SearchObserver` that is notified as the search progresses.
+            limits: Optional `SearchLimits` that bound the resources the search may use.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
+        """
+        make_frontier = functools.partial(PriorityFrontier, priority_fn=operator.attrgetter('estimated_cost'))
+        return _best_first_search(problem, make_frontier, heuristic_fn=heuristic_fn,
+                                  heuristic_cache_size=heuristic_cache_size, reopen=False, observer=observer,
+                                  limits=limits)
+
+
+class FocalSearch(SearchStrategy):
+    """Implementation of focal search (A*_epsilon).
+
+    Focal search considers every node whose estimated solution cost g(n) + h(n) is within a factor w of the smallest
+    one in the frontier, and among those expands the node with the best secondary priority, such as the estimated
+    cost to the goal. This lets it pursue promising nodes greedily while guaranteeing, for an admissible and
+    consistent heuristic, that the cost of the solution is at most w times the optimal cost. See `FocalFrontier`.
+    """
+
+    @staticmethod
+    def search(problem, heuristic_fn=None, weight=2.0, focal_priority_fn=None, heuristic_cache_size=None,
+               observer=None, limits=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            heuristic_fn: A function that accepts a state of `problem` as the single argument and returns an estimate
+                of the cost to reach the goal from that state. If None, no heuristic is used.
+            weight: The suboptimality factor w. Defaults to 2.0.
+            focal_priority_fn: An optional function that accepts a node and returns its priority within the focal
+                list, where lower values are expanded first. It does not need to be admissible. Defaults to the
+                node's estimated cost to the goal.
+            heuristic_cache_size: If given, heuristic values are memoized in a least-recently-used cache holding at
+                most this many states. See `memoize_heuristic`. Defaults to None, which disables the cache.
+            observer: An optional `SearchObserver` that is notified as the search progresses.
+            limits: Optional `SearchLimits` that bound the resources the search may use.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`. Its `suboptimality_bound`
+            is `weight`.
+        """
+        make_frontier = functools.partial(FocalFrontier, weight=weight, focal_priority_fn=focal_priority_fn)
+        return _best_first_search(problem, make_frontier, heuristic_fn=heuristic_fn,
+                                  heuristic_cache_size=heuristic_cache_size, reopen=True, observer=observer,
+                                  limits=limits, suboptimality_bound=weight)
+
+
+class AnytimeWeightedAStarSearch(SearchStrategy):
+    """Implementation of anytime weighted A* search.
+
+    Weighted A* orders nodes by g(n) + w * h(n) with a weight w > 1, which usually finds a solution after far fewer
+    expansions than A*, but one that may cost up to w times the optimal cost. Anytime weighted A* does not stop at the
+    first solution: it keeps searching, prunes every node whose unweighted g(n) + h(n) is no better than the best
+    solution found so far, and reports each improved solution as it is found. Once the frontier is empty, the last
+    solution is optimal. If the search is stopped early by its limits, it returns the best solution it found together
+    with a bound on how far from optimal that solution can be.
+
+    See Hansen and Zhou, "Anytime Heuristic Search", JAIR 2007.
+    """
+
+    @staticmethod
+    def search(problem, heuristic_fn=None, weight=2.0, observer=None, limits=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            heuristic_fn: A function that accepts a state of `problem` as the single argument and returns an estimate
+                of the cost to reach the goal from that state. It must be admissible for the suboptimality bound to
+                hold. If None, no heuristic is used.
+            weight: The weight w of the heuristic. Larger weights find a first solution faster. Defaults to 2.0.
+            observer: An optional `SearchObserver`, whose `on_solution` method is called with every improved solution.
+            limits: Optional `SearchLimits` that bound the resources the search may use.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`. Its `suboptimality_bound`
+            is 1.0 if the solution is known to be optimal.
+        """
+        assert weight >= 1.0
+        make_frontier = functools.partial(PriorityFrontier,
+                                          priority_fn=lambda node: node.path_cost + weight * node.estimated_cost)
+        return _best_first_search(problem, make_frontier, heuristic_fn=heuristic_fn, observer=observer, limits=limits,
+                                  anytime=True)
+
+
+def _bounded_depth_first_search(problem, root, bound, heuristic_fn, transpositions, monitor=None, key_fn=None,
+                                previously_generated=0):
+    """Performs a single depth-first iteration of IDA*, ignoring nodes whose estimated solution cost exceeds a bound.
+
+    Only the current path is kept in memory. States that are already on the current path are skipped, as are
+    successors that lead straight back to the state they were generated from.
+
+    Args:
+        problem: The `AbstractProblem` instance that is to be solved.
+        root: The node to start the search from.
+        bound: Nodes with an estimated solution cost greater than this are not searched.
+        heuristic_fn: The optional heuristic function being used.
+        transpositions: An optional `TranspositionTable` used to skip states that have already been searched more
+            cheaply during this iteration.
+        monitor: An optional `LimitMonitor`, which is checked before each node is expanded.
+        key_fn: The function that computes the keys of states, as returned by `_state_key_fn`, or None.
+        previously_generated: The number of nodes generated before this iteration, which count towards the node limit
+            of `monitor`.
+
+    Returns:
+        A 4-tuple with:
+            goal: The goal node that was found, or None if no goal could be found within the bound.
+            next_bound: The smallest estimated solution cost that exceeded the bound.
+            nodes_generated: The number of nodes that were generated during the iteration.
+            status: The limit that stopped the iteration, or None.
+    """
+    next_bound = math.inf
+    generated_nodes = 0
+
+    if problem.goal_test(root.state):
+        return root, next_bound, generated_nodes, None
+
+    path = [root]
+    on_path = {root.key}
+    children = root.expand(problem, heuristic_fn=heuristic_fn, key_fn=key_fn)
+    generated_nodes += len(children)
+    stack = [iter(children)]
+
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            on_path.remove(path.pop().key)
+            continue
+
+        if child.estimated_solution_cost > bound:
+            next_bound = min(next_bound, child.estimated_solution_cost)
+            continue
+        parent = child.parent.parent
+        if (parent is not None and child.key == parent.key) or child.key in on_path:
+            continue
+        if problem.goal_test(child.state):
+            return child, next_bound, generated_nodes, None
+        if transpositions is not None and transpositions.should_prune(child.key, child.path_cost):
+            continue
+        if monitor is not None:
+            status = monitor.check(previously_generated + generated_nodes)
+            if status is not None:
+                return None, next_bound, generated_nodes, status
+
+        path.append(child)
+        on_path.add(child.key)
+        children = child.expand(problem, heuristic_fn=heuristic_fn, key_fn=key_fn)
+        generated_nodes += len(children)
+        stack.append(iter(children))
+
+    return None, next_bound, generated_nodes, None
+
+
+class IterativeDeepeningAStarSearch(SearchStrategy):
+    """Implementation of iterative deepening A* (IDA*) search.
+
+    IDA* performs a series of depth-first searches, each of which ignores nodes whose estimated solution cost
+    g(n) + h(n) exceeds a bound. The bound starts at the heuristic value of the initial state, and each iteration
+    raises it to the smallest estimated solution cost that was cut off by the previous one. Since only the current
+    path is stored, the memory used is linear in the depth of the solution rather than in the size of the state space.
+    """
+
+    @staticmethod
+    def search(problem, heuristic_fn=None, transposition_table_size=None, limits=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            heuristic_fn: A function that accepts a state of `problem` as the single argument and returns an estimate
+                of the cost to reach the goal from that state. If None, no heuristic is used.
+            transposition_table_size: If given, a `TranspositionTable` holding at most this many states is used to
+                avoid searching a state more than once per iteration. Defaults to None, which uses no table.
+            limits: Optional `SearchLimits` that bound the resources the search may use.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`. Its `iterations` is the
+            number of depth-first iterations that were performed.
+        """
+        assert isinstance(problem, AbstractProblem)
+        rejected = _reject_unsolvable(problem)
+        if rejected is not None:
+            rejected.iterations = 0
+            return rejected
+        start_time = time.perf_counter()
+        monitor = None if limits is None else limits.start()
+        estimated_cost = 0.0 if heuristic_fn is None else heuristic_fn(problem.initial_state)
+        key_fn = _state_key_fn(problem)
+        root = Node(problem.initial_state, 0, estimated_cost,
+                    key=None if key_fn is None else key_fn(problem.initial_state))
+        generated_nodes = 1
+        transpositions = None if not transposition_table_size else TranspositionTable(transposition_table_size)
+
+        bound = root.estimated_solution_cost
+        iterations = 0
+        while True:
+            iterations += 1
+            if transpositions is not None:
+                transpositions.clear()
+            goal, bound, generated, status = _bounded_depth_first_search(
+                problem, root, bound, heuristic_fn, transpositions, monitor, key_fn, generated_nodes)
+            generated_nodes += generated
+            if goal is not None or status is not None or bound == math.inf:
+                break
 
-        return solution, generated_nodes
+        return SearchResult(
+            solution=None if goal is None else goal.solution,
+            nodes_generated=generated_nodes,
+            status=status,
+            solution_cost=None if goal is None else goal.path_cost,
+            elapsed_time=time.perf_counter() - start_time,
+            iterations=iterations
+        )
@@ -0,0 +1,276 @@
+"""Provides a parallel implementation of A* that uses several processes to solve a single problem.
+
+Author: Ryan Strauss
+"""
+
+import heapq
+import itertools
+import math
+import multiprocessing
+import queue
+import time
+
+from cannibals.problems.base import AbstractProblem
+from cannibals.search.base import SearchStrategy, SearchResult, Node, _reject_unsolvable
+
+_MASK = (1 << 64) - 1
+
+
+def _owner(state, num_workers):
+    """Assigns a state to a worker.
+
+    The state's hash is scrambled with the finalizer of SplitMix64 first, since hashes such as those of small
+    integers or of packed boards vary mostly in some of their bits and would otherwise be spread unevenly.
+    """
+    x = hash(state) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return (x ^ (x >> 31)) % num_workers
+
+
+class _Worker:
+    """One process of `HashDistributedAStarSearch`, which searches the states that it owns.
+
+    Every state that a worker generates is sent to the worker that owns it as a message
+    `(state, path_cost, estimated_cost, parent_state, action)`, and messages are sent in batches to reduce the
+    overhead of the queues. The owner keeps the cheapest path cost of each of its states along with the state and
+    action it was reached from, which is enough to rebuild the solution once the search is over.
+    """
+
+    def __init__(self, index, problem, heuristic_fn, shared, batch_size):
+        self.index = index
+        self.problem = problem
+        self.heuristic_fn = heuristic_fn
+        self.shared = shared
+        self.num_workers = len(shared['inboxes'])
+        self.batch_size = batch_size
+
+        self.open = []
+        self.counter = itertools.count()
+        self.best_path_cost = {}
+        self.parents = {}
+        self.goal = None
+        self.outgoing = [[] for _ in range(self.num_workers)]
+        self.nodes_generated = 0
+        self.nodes_expanded = 0
+
+    def insert(self, message):
+        state, path_cost, estimated_cost, parent_state, action = message
+        if path_cost >= self.best_path_cost.get(state, math.inf):
+            return
+        self.best_path_cost[state] = path_cost
+        self.parents[state] = parent_state, action
+
+        incumbent = self.shared['incumbent']
+        if self.problem.goal_test(state):
+            with incumbent.get_lock():
+                if path_cost < incumbent.value:
+                    incumbent.value = path_cost
+                    self.shared['goal_owner'].value = self.index
+                    self.goal = state
+        elif path_cost + estimated_cost < incumbent.value:
+            heapq.heappush(self.open, (path_cost + estimated_cost, -path_cost, next(self.counter), state,
+                                       estimated_cost, action))
+
+    def receive(self, batch):
+        self.shared['idle'][self.index] = 0
+        self.shared['received'][self.index] += 1
+        for message in batch:
+            self.insert(message)
+
+    def send(self, owner):
+        batch = self.outgoing[owner]
+        if batch:
+            self.outgoing[owner] = []
+            self.shared['sent'][self.index] += 1
+            self.shared['inboxes'][owner].put(batch)
+
+    def expand(self):
+        """Expands the best open node, returning False if there was no node that could lead to a better solution."""
+        while self.open:
+            estimated_solution_cost, negative_path_cost, _, state, estimated_cost, action = heapq.heappop(self.open)
+            # Every other open node is at least as expensive, so none of them can lead to a better solution either
+            if estimated_solution_cost >= self.shared['incumbent'].value:
+                self.open.clear()
+                return False
+            if -negative_path_cost > self.best_path_cost[state]:
+                continue
+
+            node = Node(state, -negative_path_cost, estimated_cost, action=action)
+            children = node.expand(self.problem, heuristic_fn=self.heuristic_fn)
+            self.nodes_expanded += 1
+            self.nodes_generated += len(children)
+            for child in children:
+                message = child.state, child.path_cost, child.estimated_cost, state, child.action
+                owner = _owner(child.state, self.num_workers)
+                if owner == self.index:
+                    self.insert(message)
+                else:
+                    self.outgoing[owner].append(message)
+                    if len(self.outgoing[owner]) >= self.batch_size:
+                        self.send(owner)
+            return True
+        return False
+
+    def search(self, expansions_per_poll):
+        inbox = self.shared['inboxes'][self.index]
+        done = self.shared['done']
+        while not done.is_set():
+            while True:
+                try:
+                    self.receive(inbox.get_nowait())
+                except queue.Empty:
+                    break
+
+            expanded = 0
+            while expanded < expansions_per_poll and self.expand():
+                expanded += 1
+            if expanded:
+                continue
+
+            # There is nothing left to expand, so everything that is waiting to be sent is sent before waiting
+            for owner in range(self.num_workers):
+                self.send(owner)
+            self.shared['idle'][self.index] = 1
+            try:
+                self.receive(inbox.get(timeout=0.01))
+            except queue.Empty:
+                pass
+
+    def serve(self):
+        """Answers the coordinator's questions about the search once it is over, until told to stop."""
+        control, replies = self.shared['controls'][self.index], self.shared['replies']
+        while True:
+            request, state = control.get()
+            if request == 'goal':
+                replies.put(self.goal)
+            elif request == 'parent':
+                replies.put(self.parents[state])
+            else:
+                replies.put((self.nodes_generated, self.nodes_expanded))
+                return
+
+
+def _run_worker(index, problem, heuristic_factory, shared, batch_size, expansions_per_poll):
+    heuristic_fn = None if heuristic_factory is None else heuristic_factory(problem)
+    worker = _Worker(index, problem, heuristic_fn, shared, batch_size)
+    worker.search(expansions_per_poll)
+    worker.serve()
+
+
+class HashDistributedAStarSearch(SearchStrategy):
+    """Implementation of hash-distributed A* (HDA*), which solves a single problem with several processes.
+
+    Each worker process owns the states that a hash function assigns to it and runs A* over them. Successors are sent
+    to the worker that owns them, so duplicates are detected locally by their owner. Once a goal has been found, its
+    cost is shared with every worker, which then only expands nodes that could lead to a cheaper solution. The search
+    is over when every worker has run out of such nodes and every message that was sent has been received, which is
+    checked by comparing two consecutive snapshots of the workers' message counters. With an admissible heuristic,
+    the solution is optimal, as with `AStarSearch`.
+
+    States are assigned to workers by their hash, so they must hash the same way in every process. This is true of
+    integers and of the boards of the sliding tile puzzle, but not of strings when processes are started with the
+    'spawn' method, unless `PYTHONHASHSEED` is set.
+
+    See Kishimoto et al., "Evaluation of a Simple, Scalable, Parallel Best-First Search Strategy", Artificial
+    Intelligence 195, 2013.
+    """
+
+    @staticmethod
+    def search(problem, heuristic_factory=None, num_workers=None, batch_size=64, expansions_per_poll=64,
+               mp_context=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            heuristic_factory: An optional function that accepts a problem as the single argument and returns the
+                heuristic function to use for it, such as `functools.partial(make_heuristic_fn,
+                heuristic_fn=manhattan_distance)`. Each worker builds its own heuristic function with it, since those
+                returned by `make_heuristic_fn` cannot be sent to other processes. If None, no heuristic is used.
+            num_workers: The number of worker processes. Defaults to the number of processors on the machine.
+            batch_size: The number of messages that a worker collects for another worker before sending them.
+            expansions_per_poll: The number of nodes that a worker expands between checks for incoming messages.
+            mp_context: The `multiprocessing` context used to start the workers. Defaults to the default context.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
+        """
+        assert isinstance(problem, AbstractProblem)
+        rejected = _reject_unsolvable(problem)
+        if rejected is not None:
+            return rejected
+        start_time = time.perf_counter()
+        context = mp_context or multiprocessing.get_context()
+        num_workers = num_workers or multiprocessing.cpu_count()
+
+        # The last slot of `sent` belongs to the coordinator, which sends the root
+        shared = {
+            'inboxes': [context.Queue() for _ in range(num_workers)],
+            'controls': [context.Queue() for _ in range(num_workers)],
+            'replies': context.Queue(),
+            'incumbent': context.Value('d', math.inf),
+            'goal_owner': context.Value('i', -1),
+            'sent': context.Array('q', num_workers + 1, lock=False),
+            'received': context.Array('q', num_workers, lock=False),
+            'idle': context.Array('b', num_workers, lock=False),
+            'done': context.Event(),
+        }
+        workers = [context.Process(target=_run_worker, daemon=True,
+                                   args=(i, problem, heuristic_factory, shared, batch_size, expansions_per_poll))
+                   for i in range(num_workers)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            heuristic_fn = None if heuristic_factory is None else heuristic_factory(problem)
+            root = problem.initial_state
+            estimated_cost = 0.0 if heuristic_fn is None else heuristic_fn(root)
+            shared['sent'][num_workers] += 1
+            shared['inboxes'][_owner(root, num_workers)].put([(root, 0, estimated_cost, None, None)])
+
+            previous = None
+            while True:
+                time.sleep(0.001)
+                if any(not worker.is_alive() for worker in workers):
+                    raise RuntimeError('a worker process of the parallel search exited unexpectedly')
+                snapshot = tuple(shared['sent']), tuple(shared['received']), tuple(shared['idle'])
+                if all(snapshot[2]) and sum(snapshot[0]) == sum(snapshot[1]) and snapshot == previous:
+                    break
+                previous = snapshot
+            shared['done'].set()
+
+            controls, replies = shared['controls'], shared['replies']
+            solution = None
+            if shared['goal_owner'].value >= 0:
+                controls[shared['goal_owner'].value].put(('goal', None))
+                state = replies.get()
+                solution = []
+                while True:
+                    controls[_owner(state, num_workers)].put(('parent', state))
+                    state, action = replies.get()
+                    if state is None:
+                        break
+                    solution.append(action)
+                solution.reverse()
+
+            generated_nodes = 1
+            expanded_nodes = 0
+            for control in controls:
+                control.put(('stop', None))
+                generated, expanded = replies.get()
+                generated_nodes += generated
+                expanded_nodes += expanded
+        finally:
+            shared['done'].set()
+            for worker in workers:
+                worker.join(timeout=1)
+                if worker.is_alive():
+                    worker.terminate()
+
+        return SearchResult(
+            solution=solution,
+            nodes_generated=generated_nodes,
+            nodes_expanded=expanded_nodes,
+            solution_cost=None if solution is None else shared['incumbent'].value,
+            elapsed_time=time.perf_counter() - start_time
+        )
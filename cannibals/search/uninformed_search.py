@@ -3,73 +3,325 @@
 Author: Ryan Strauss
 """
 
+import math
+import time
+from array import array
+
 from cannibals.problems.base import AbstractProblem
-from cannibals.search.base import Node, SearchStrategy
+from cannibals.search.base import Node, SearchStrategy, SearchResult, TranspositionTable, _reject_unsolvable, \
+    _state_key_fn
 from cannibals.search.frontiers import FIFOFrontier, LIFOFrontier, Frontier
-from cannibals.search.informed_search import AStarSearch
+from cannibals.search.informed_search import AStarSearch, IterativeDeepeningAStarSearch, _bounded_depth_first_search
 
 
-def _graph_search(frontier_type, problem):
+def _graph_search(frontier_type, problem, observer=None, limits=None):
     """Performs a graph search.
 
     Args:
         frontier_type: The type of frontier to use. Should be a subclass of `Frontier`.
         problem: The `AbstractProblem` instance that is to be solved.
+        observer: An optional `SearchObserver` that is notified as the search progresses.
+        limits: Optional `SearchLimits` that bound the resources the search may use.
 
     Returns:
-        A 2-tuple with:
-            solution: A list of actions that represents the solution to the problem.
-            nodes_generated: The number of nodes that were generated during the search process.
+        A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
     """
     assert isinstance(problem, AbstractProblem)
     assert issubclass(frontier_type, Frontier)
-    node = Node(problem.initial_state, 0)
+    rejected = _reject_unsolvable(problem, observer)
+    if rejected is not None:
+        return rejected
+    start_time = time.perf_counter()
+    key_fn = _state_key_fn(problem)
+    node = Node(problem.initial_state, 0, key=None if key_fn is None else key_fn(problem.initial_state))
     generated_nodes = 1
-
-    if problem.goal_test(node.state):
-        return node.solution
+    expanded_nodes = duplicates = 0
+    expand_time = 0.0
 
     frontier = frontier_type([node])
+    max_frontier_size = 1
     explored = set()
-    solution = None
+    goal = node if problem.goal_test(node.state) else None
+    monitor = None if limits is None else limits.start()
+    status = None
+
+    while goal is None and not frontier.empty():
+        if monitor is not None:
+            status = monitor.check(generated_nodes)
+            if status is not None:
+                break
 
-    while not frontier.empty():
         node = frontier.pop()
-        explored.add(node)
-        children = node.expand(problem)
+        explored.add(node.key)
+        if observer is None:
+            children = node.expand(problem, key_fn=key_fn)
+        else:
+            tick = time.perf_counter()
+            children = node.expand(problem, key_fn=key_fn)
+            expand_time += time.perf_counter() - tick
+            observer.on_expand(node, children)
         generated_nodes += len(children)
+        expanded_nodes += 1
+
         for child in children:
-            if not (child in explored or child in frontier):
-                if problem.goal_test(child.state):
-                    solution = child.solution
+            if child.key in explored or child in frontier:
+                duplicates += 1
+                continue
+            if problem.goal_test(child.state):
+                goal = child
+                break
+            frontier.push(child)
+
+        if len(frontier) > max_frontier_size:
+            max_frontier_size = len(frontier)
+
+    elapsed_time = time.perf_counter() - start_time
+    result = SearchResult(
+        solution=None if goal is None else goal.solution,
+        nodes_generated=generated_nodes,
+        status=status,
+        nodes_expanded=expanded_nodes,
+        max_frontier_size=max_frontier_size,
+        explored_size=len(explored),
+        duplicates=duplicates,
+        solution_cost=None if goal is None else goal.path_cost,
+        elapsed_time=elapsed_time,
+        phase_times=None if observer is None else {'expand': expand_time, 'frontier': elapsed_time - expand_time}
+    )
+    if observer is not None:
+        observer.on_finish(result)
+    return result
+
+
+# Marks the initial state in the visited array of `_compact_breadth_first_search`, whose other entries are zero for
+# unvisited states and one plus the code of the action that reached the state otherwise
+_ROOT_CODE = 255
+
+
+def _compact_breadth_first_search(problem, limits=None):
+    """Performs a breadth-first search that stores states by their rank rather than as nodes.
+
+    Instead of a set of explored nodes, a `bytearray` with one entry per rank records which action first reached each
+    state, and the frontier is an array of the ranks in the current layer. The solution is rebuilt by walking back from
+    the goal, using the reverse transition model if the problem has one and an array of parent ranks otherwise.
+
+    Args:
+        problem: The `AbstractProblem` instance that is to be solved. It must implement the ranking interface, and its
+            states must have at most 254 distinct actions between them.
+        limits: Optional `SearchLimits` that bound the resources the search may use.
+
+    Returns:
+        A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
+    """
+    assert isinstance(problem, AbstractProblem)
+    rejected = _reject_unsolvable(problem)
+    if rejected is not None:
+        return rejected
+    start_time = time.perf_counter()
+    size = problem.state_space_size()
+    try:
+        problem.get_reverse_actions(problem.initial_state)
+        parents = None
+    except NotImplementedError:
+        parents = array('q', [0]) * size
+
+    actions, codes = [], {}
+    visited = bytearray(size)
+    root = problem.rank(problem.initial_state)
+    visited[root] = _ROOT_CODE
+    layer = array('q', [root])
+    generated_nodes = 1
+    expanded_nodes = duplicates = 0
+    max_frontier_size = explored_size = 1
+    goal = root if problem.goal_test(problem.initial_state) else None
+    monitor = None if limits is None else limits.start()
+    status = None
+
+    while goal is None and layer and status is None:
+        next_layer = array('q')
+        for parent_rank in layer:
+            if monitor is not None:
+                status = monitor.check(generated_nodes)
+                if status is not None:
                     break
-                frontier.push(child)
-        else:
-            continue
-        break
 
-    return solution, generated_nodes
+            state = problem.unrank(parent_rank)
+            expanded_nodes += 1
+            for action in problem.get_actions(state):
+                child, _ = problem.transition(state, action)
+                generated_nodes += 1
+                child_rank = problem.rank(child)
+                if visited[child_rank]:
+                    duplicates += 1
+                    continue
+
+                code = codes.get(action)
+                if code is None:
+                    if len(actions) == _ROOT_CODE - 1:
+                        raise ValueError('compact search supports at most 254 distinct actions')
+                    code = codes[action] = len(actions)
+                    actions.append(action)
+                visited[child_rank] = code + 1
+                if parents is not None:
+                    parents[child_rank] = parent_rank
+                explored_size += 1
+
+                if problem.goal_test(child):
+                    goal = child_rank
+                    break
+                next_layer.append(child_rank)
+
+            if goal is not None:
+                break
+
+        layer = next_layer
+        max_frontier_size = max(max_frontier_size, len(layer))
+
+    solution = solution_cost = None
+    if goal is not None:
+        solution, solution_cost = [], 0
+        rank = goal
+        state = problem.unrank(rank)
+        while visited[rank] != _ROOT_CODE:
+            action = actions[visited[rank] - 1]
+            if parents is None:
+                state, step_cost = problem.reverse_transition(state, action)
+                rank = problem.rank(state)
+            else:
+                rank = parents[rank]
+                state = problem.unrank(rank)
+                _, step_cost = problem.transition(state, action)
+            solution.append(action)
+            solution_cost += step_cost
+        solution.reverse()
+
+    return SearchResult(
+        solution=solution,
+        nodes_generated=generated_nodes,
+        status=status,
+        nodes_expanded=expanded_nodes,
+        max_frontier_size=max_frontier_size,
+        explored_size=explored_size,
+        duplicates=duplicates,
+        solution_cost=solution_cost,
+        elapsed_time=time.perf_counter() - start_time
+    )
 
 
 class BreadthFirstSearch(SearchStrategy):
     """Implementation of breadth-first search."""
 
     @staticmethod
-    def search(problem):
-        return _graph_search(FIFOFrontier, problem)
+    def search(problem, observer=None, limits=None, compact=False):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            observer: An optional `SearchObserver` that is notified as the search progresses. Not supported when
+                `compact` is True.
+            limits: Optional `SearchLimits` that bound the resources the search may use.
+            compact: If True, states are stored by their rank in flat arrays instead of as nodes, which uses a few
+                bytes per state instead of hundreds. The problem must implement `state_space_size`, `rank` and
+                `unrank`, and the memory used is proportional to `state_space_size()`. Defaults to False.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
+        """
+        if compact:
+            if observer is not None:
+                raise ValueError('observers are not supported by compact breadth-first search')
+            return _compact_breadth_first_search(problem, limits=limits)
+        return _graph_search(FIFOFrontier, problem, observer=observer, limits=limits)
 
 
 class DepthFirstSearch(SearchStrategy):
     """Implementation of depth-first search."""
 
     @staticmethod
-    def search(problem):
-        return _graph_search(LIFOFrontier, problem)
+    def search(problem, observer=None, limits=None, track_explored=True, transposition_table_size=None,
+               max_path_cost=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            observer: An optional `SearchObserver` that is notified as the search progresses. Not supported when
+                `track_explored` is False.
+            limits: Optional `SearchLimits` that bound the resources the search may use.
+            track_explored: If True, every state that has been reached is remembered, so that no state is searched
+                twice. If False, only the current path is kept in memory and a state is skipped only when it is
+                already on that path, so the memory used is proportional to the depth of the search rather than to the
+                size of the state space, at the cost of possibly searching states many times. Defaults to True.
+            transposition_table_size: If given and `track_explored` is False, a `TranspositionTable` holding at most
+                this many states is used to avoid searching a state again through a more expensive path. Defaults to
+                None, which uses no table.
+            max_path_cost: If given and `track_explored` is False, nodes whose path cost exceeds this are not
+                searched. When every action costs one, this limits the depth of the search, which keeps it from
+                wandering down very long paths. Defaults to None, which sets no limit.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
+        """
+        if track_explored:
+            return _graph_search(LIFOFrontier, problem, observer=observer, limits=limits)
+        if observer is not None:
+            raise ValueError('observers are not supported by depth-first search without an explored set')
+
+        assert isinstance(problem, AbstractProblem)
+        rejected = _reject_unsolvable(problem)
+        if rejected is not None:
+            return rejected
+        start_time = time.perf_counter()
+        transpositions = None if not transposition_table_size else TranspositionTable(transposition_table_size)
+        monitor = None if limits is None else limits.start()
+        bound = math.inf if max_path_cost is None else max_path_cost
+        key_fn = _state_key_fn(problem)
+        root = Node(problem.initial_state, 0, key=None if key_fn is None else key_fn(problem.initial_state))
+        goal, next_bound, generated_nodes, status = _bounded_depth_first_search(
+            problem, root, bound, None, transpositions, monitor, key_fn)
+        if goal is None and status is None and next_bound < math.inf:
+            status = 'cost_limit'
+
+        return SearchResult(
+            solution=None if goal is None else goal.solution,
+            nodes_generated=generated_nodes + 1,
+            status=status,
+            solution_cost=None if goal is None else goal.path_cost,
+            elapsed_time=time.perf_counter() - start_time
+        )
+
+
+class IterativeDeepeningSearch(SearchStrategy):
+    """Implementation of iterative deepening search.
+
+    Iterative deepening search performs a series of depth-first searches that only keep the current path in memory,
+    each of which ignores nodes whose path cost exceeds a limit. The limit starts at zero and each iteration raises it
+    to the smallest path cost that was cut off by the previous one, so the first solution found is the cheapest one.
+    When every action costs one, the limit is the depth of the search.
+
+    This is IDA* without a heuristic, so it delegates to `IterativeDeepeningAStarSearch`.
+    """
+
+    @staticmethod
+    def search(problem, transposition_table_size=None, limits=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            transposition_table_size: If given, a `TranspositionTable` holding at most this many states is used to
+                avoid searching a state more than once per iteration. Defaults to None, which uses no table.
+            limits: Optional `SearchLimits` that bound the resources the search may use.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`. Its `iterations` is the
+            number of depth-first iterations that were performed.
+        """
+        return IterativeDeepeningAStarSearch.search(problem, transposition_table_size=transposition_table_size,
+                                                    limits=limits)
 
 
 class UniformCostSearch(SearchStrategy):
     """Implementation of uniform-cost search."""
 
     @staticmethod
-    def search(problem):
-        return AStarSearch.search(problem)
+    def search(problem, observer=None, limits=None):
+        return AStarSearch.search(problem, observer=observer, limits=limits)
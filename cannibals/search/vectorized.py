@@ -0,0 +1,151 @@
+"""Implementations of breadth-first search that expand a whole layer of states at once with NumPy.
+
+These strategies can only be used with problems that implement the vectorized interface of `AbstractProblem`
+(`encode`, `decode`, `batch_successors` and `batch_actions`), and they require NumPy, which is imported when a search
+is run rather than when this module is imported.
+
+Author: Ryan Strauss
+"""
+
+import time
+
+from cannibals.problems.base import AbstractProblem
+from cannibals.search.base import SearchStrategy, SearchResult, _reject_unsolvable
+
+
+def _check_codes(*codes):
+    """Raises a `ValueError` if any of the given codes does not fit in the `uint64` arrays that the search uses."""
+    for code in codes:
+        if not 0 <= code < 2 ** 64:
+            raise ValueError(f'vectorized search needs states whose codes fit in 64 bits, but got a code of '
+                             f'{code.bit_length()} bits')
+
+
+def _expand_layers(problem, start, stop=None, monitor=None):
+    """Runs a breadth-first search over encoded states, one layer at a time.
+
+    Each layer is expanded with a single call to `batch_successors`. Its successors are deduplicated with
+    `np.unique`, and those that were already reached are removed by searching for them in a sorted array of every
+    code seen so far.
+
+    Args:
+        problem: The `AbstractProblem` to search.
+        start: The code of the state to start from.
+        stop: An optional code at which to stop the search, once the layer that contains it has been generated.
+        monitor: An optional `LimitMonitor`, which is checked before each layer is expanded.
+
+    Returns:
+        A 3-tuple with:
+            layers: A list with a `(codes, parents, actions)` tuple of arrays for each layer, where `codes` is sorted
+                and `parents` gives the index in the previous layer of the state each state was reached from.
+            nodes_generated: The number of successors that were generated.
+            status: The limit that stopped the search, or None.
+    """
+    import numpy as np
+
+    codes = np.array([start], dtype=np.uint64)
+    layers = [(codes, np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.uint8))]
+    seen = codes
+    generated_nodes = 1
+
+    while len(codes) and (stop is None or stop not in codes):
+        if monitor is not None:
+            status = monitor.check(generated_nodes)
+            if status is not None:
+                return layers, generated_nodes, status
+
+        parents, actions, children = problem.batch_successors(codes)
+        generated_nodes += len(children)
+        children, first = np.unique(children, return_index=True)
+        # `seen` is sorted, so the children that are already in it are found with a binary search
+        positions = np.minimum(np.searchsorted(seen, children), len(seen) - 1)
+        new = seen[positions] != children
+
+        codes = children[new]
+        layers.append((codes, parents[first[new]], actions[first[new]]))
+        seen = np.union1d(seen, codes)
+
+    return layers, generated_nodes, None
+
+
+def breadth_first_depths(problem, state=None):
+    """Computes the distance from a state to every state that can be reached from it.
+
+    This is useful for analysing the whole state space of small problems, such as building distance tables or
+    finding which states are solvable.
+
+    Args:
+        problem: The `AbstractProblem` to search. It must implement the vectorized interface.
+        state: The state to start from. Defaults to the problem's initial state.
+
+    Returns:
+        A 2-tuple of NumPy arrays with:
+            codes: The sorted codes of the reachable states, as returned by `problem.encode`.
+            depths: The number of actions it takes to reach each of those states.
+    """
+    import numpy as np
+
+    assert isinstance(problem, AbstractProblem)
+    start = problem.encode(problem.initial_state if state is None else state)
+    _check_codes(start)
+    layers, _, _ = _expand_layers(problem, start)
+    codes = np.concatenate([layer[0] for layer in layers])
+    depths = np.concatenate([np.full(len(layer[0]), depth, dtype=np.int32) for depth, layer in enumerate(layers)])
+    order = np.argsort(codes)
+    return codes[order], depths[order]
+
+
+class VectorizedBreadthFirstSearch(SearchStrategy):
+    """Implementation of breadth-first search that expands a whole layer at a time.
+
+    Rather than popping nodes off a frontier one by one, the search generates the successors of every state in a layer
+    with a single call to the problem's `batch_successors` and deduplicates them with array operations. This makes it
+    orders of magnitude faster than `BreadthFirstSearch` on problems that support it. The problem must implement the
+    vectorized interface of `AbstractProblem` and declare a `goal_state`, its codes must fit in 64 bits, and every
+    action must have a step cost of one.
+    """
+
+    @staticmethod
+    def search(problem, limits=None):
+        """Attempts to solve the given problem by performing a search over the state space.
+
+        Args:
+            problem: The `AbstractProblem` instance that is to be solved.
+            limits: Optional `SearchLimits` that bound the resources the search may use. They are checked before
+                each layer is expanded.
+
+        Returns:
+            A `SearchResult`, which unpacks as the 2-tuple `(solution, nodes_generated)`.
+        """
+        assert isinstance(problem, AbstractProblem)
+        if problem.goal_state is None:
+            raise ValueError('vectorized breadth-first search requires a problem with an explicit goal state')
+        rejected = _reject_unsolvable(problem)
+        if rejected is not None:
+            return rejected
+        start_time = time.perf_counter()
+        start, goal = problem.encode(problem.initial_state), problem.encode(problem.goal_state)
+        _check_codes(start, goal)
+        monitor = None if limits is None else limits.start()
+        layers, generated_nodes, status = _expand_layers(problem, start, goal, monitor)
+
+        solution = None
+        codes = layers[-1][0]
+        if status is None and goal in codes:
+            solution = []
+            index = int(codes.searchsorted(goal))
+            for _, parents, actions in reversed(layers[1:]):
+                solution.append(problem.batch_actions[actions[index]])
+                index = parents[index]
+            solution.reverse()
+
+        return SearchResult(
+            solution=solution,
+            nodes_generated=generated_nodes,
+            status=status,
+            nodes_expanded=sum(len(layer[0]) for layer in layers[:-1]),
+            max_frontier_size=max(len(layer[0]) for layer in layers),
+            explored_size=sum(len(layer[0]) for layer in layers),
+            solution_cost=None if solution is None else len(solution),
+            elapsed_time=time.perf_counter() - start_time
+        )
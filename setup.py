@@ -14,5 +14,7 @@ setuptools.setup(
     description='Search strategies for problem-solving agents.',
     long_description=long_description,
     long_description_content_type='text/markdown',
-    python_requires='>=3.6'
+    python_requires='>=3.7',
+    extras_require={'vectorized': ['numpy']},
+    entry_points={'console_scripts': ['cannibals = cannibals.cli:main']}
 )
@@ -0,0 +1,35 @@
+import asyncio
+
+from cannibals.problems.sliding_tile.board import Board
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+from cannibals.search.asynchronous import search_async
+from cannibals.search.base import SearchLimits
+from cannibals.search.batch import _BudgetedProblem, solve_batch
+from cannibals.search.uninformed_search import BreadthFirstSearch
+
+# A 15-puzzle instance that is not already solved, so a search with no time left stops before finding a solution
+HARD = '5,1,2,3,9,6,7,4,13,10,11,8,0,14,15,12'
+
+
+def test_solve_batch_reports_time_limit():
+    problem = SlidingTilePuzzle(Board([int(t) for t in HARD.split(',')]))
+    [result] = solve_batch([problem], BreadthFirstSearch, timeout=0.0, max_workers=1)
+    assert result.status == 'time_limit'
+
+
+def test_search_async_reports_time_limit():
+    problem = SlidingTilePuzzle(Board([int(t) for t in HARD.split(',')]))
+    result = asyncio.run(search_async(BreadthFirstSearch, problem, timeout=0.0))
+    assert result.status == 'time_limit'
+
+
+def test_solve_batch_keeps_the_status_of_search_limits():
+    problem = SlidingTilePuzzle(Board([int(t) for t in HARD.split(',')]))
+    limits = SearchLimits(max_nodes=50)
+    [result] = solve_batch([problem], BreadthFirstSearch, search_kwargs={'limits': limits}, max_workers=1)
+    assert result.status == BreadthFirstSearch.search(problem, limits=limits).status == 'node_limit'
+
+
+def test_budgeted_problem_forwards_canonical_key():
+    problem = SlidingTilePuzzle(Board([int(t) for t in HARD.split(',')]))
+    assert _BudgetedProblem(problem, None, None).canonical_key() == problem.canonical_key()
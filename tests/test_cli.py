@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from cannibals.cli import main
+
+
+def run(tmp_path, capsys, lines, *args):
+    path = tmp_path / 'instances.txt'
+    path.write_text('\n'.join(lines) + '\n')
+    status = main([str(path), *args])
+    return status, [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_solves_each_instance(tmp_path, capsys):
+    status, records = run(tmp_path, capsys, ['635841027 865317024', '1,2,3,4,5,6,7,8,0'])
+    assert status == 0
+    assert [record['status'] for record in records] == ['solved', 'solved']
+    assert records[0]['length'] == 10
+    assert records[1]['solution'] == ''
+
+
+def test_mismatched_board_sizes_are_reported_per_line(tmp_path, capsys):
+    status, records = run(tmp_path, capsys, ['1230 123456780', '635841027 865317024'])
+    assert status == 1
+    assert records[0]['status'] == 'error'
+    assert '2x2' in records[0]['error'] and '3x3' in records[0]['error']
+    assert records[1]['status'] == 'solved'
+
+
+def test_strategy_that_requires_a_heuristic_rejects_none(tmp_path, capsys):
+    with pytest.raises(SystemExit) as info:
+        run(tmp_path, capsys, ['635841027 865317024'], '-s', 'greedy', '-H', 'none')
+    assert info.value.code == 2
+    assert 'greedy requires a heuristic' in capsys.readouterr().err
+
+
+def test_strategy_without_a_heuristic_accepts_none(tmp_path, capsys):
+    status, records = run(tmp_path, capsys, ['635841027 865317024'], '-s', 'bfs', '-H', 'none')
+    assert status == 0
+    assert records[0]['length'] == 10
+
+
+def test_strategy_errors_are_reported_per_line(tmp_path, capsys):
+    board = ','.join(str(tile) for tile in list(range(1, 25)) + [0])
+    status, records = run(tmp_path, capsys, [board, '123456708'], '-s', 'vectorized-bfs')
+    assert status == 1
+    assert records[0]['status'] == 'error'
+    assert records[0]['error']
+    assert records[1]['status'] == 'solved'
@@ -0,0 +1,69 @@
+from cannibals.problems.sliding_tile.heuristics import make_heuristic_fn, manhattan_distance
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+from cannibals.search.base import SearchLimits, SearchObserver, SearchResult
+from cannibals.search.informed_search import AStarSearch, AnytimeWeightedAStarSearch, IterativeDeepeningAStarSearch, \
+    memoize_heuristic
+
+
+def test_memoize_heuristic_keeps_incremental_and_batch():
+    problem = SlidingTilePuzzle('635841027', '865317024')
+    heuristic_fn = make_heuristic_fn(problem, manhattan_distance, incremental=True)
+    heuristic_fn.batch = lambda states: [heuristic_fn(state) for state in states]
+    memoized = memoize_heuristic(heuristic_fn, 16)
+    assert memoized.incremental is heuristic_fn.incremental
+    assert memoized.batch is heuristic_fn.batch
+
+
+def test_heuristic_cache_size_does_not_disable_incremental_evaluation():
+    problem = SlidingTilePuzzle('867254301')
+    heuristic_fn = make_heuristic_fn(problem, manhattan_distance, incremental=True)
+    calls = []
+
+    def counting_fn(state):
+        calls.append(state)
+        return heuristic_fn(state)
+
+    counting_fn.incremental = heuristic_fn.incremental
+    result = AStarSearch.search(problem, counting_fn, heuristic_cache_size=1024)
+    assert result.solution_cost == 31
+    # Only the initial state is evaluated from scratch
+    assert len(calls) == 1
+
+
+def test_iterative_deepening_a_star_returns_search_result():
+    problem = SlidingTilePuzzle('867254301')
+    result = IterativeDeepeningAStarSearch.search(problem, make_heuristic_fn(problem, manhattan_distance))
+    assert isinstance(result, SearchResult)
+    solution, nodes_generated = result
+    assert len(solution) == result.solution_cost == 31
+    assert nodes_generated > 0
+    assert result.status == 'solved'
+    assert result.iterations > 1
+
+
+def test_iterative_deepening_a_star_unsolvable():
+    result = IterativeDeepeningAStarSearch.search(SlidingTilePuzzle('123456870'))
+    assert result.solution is None
+    assert result.status == 'unsolvable'
+    assert result.iterations == 0
+
+
+def test_anytime_weighted_a_star_improves_to_an_optimal_solution():
+    class SolutionRecorder(SearchObserver):
+        def __init__(self):
+            self.costs = []
+
+        def on_solution(self, node, suboptimality_bound):
+            self.costs.append(node.path_cost)
+
+    problem = SlidingTilePuzzle('867254301')
+    heuristic_fn = make_heuristic_fn(problem, manhattan_distance)
+    observer = SolutionRecorder()
+    result = AnytimeWeightedAStarSearch.search(problem, heuristic_fn, weight=5.0, observer=observer)
+    assert result.solution_cost == 31
+    assert result.suboptimality_bound == 1.0
+    assert observer.costs == sorted(observer.costs, reverse=True) and observer.costs[-1] == 31
+
+    stopped = AnytimeWeightedAStarSearch.search(problem, heuristic_fn, weight=5.0, limits=SearchLimits(max_nodes=500))
+    assert stopped.status == 'node_limit'
+    assert stopped.suboptimality_bound >= stopped.solution_cost / 31
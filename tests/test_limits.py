@@ -0,0 +1,38 @@
+import builtins
+import sys
+
+from cannibals.problems.sliding_tile.heuristics import make_heuristic_fn, manhattan_distance
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+from cannibals.search import base
+from cannibals.search.base import SearchLimits
+from cannibals.search.informed_search import IterativeDeepeningAStarSearch
+from cannibals.search.uninformed_search import IterativeDeepeningSearch
+
+
+def test_memory_limit_is_skipped_when_memory_cannot_be_measured(monkeypatch):
+    def open_without_proc(path, *args, **kwargs):
+        if str(path).startswith('/proc'):
+            raise OSError(path)
+        return builtins_open(path, *args, **kwargs)
+
+    builtins_open = builtins.open
+    monkeypatch.setattr(builtins, 'open', open_without_proc)
+    monkeypatch.setitem(sys.modules, 'resource', None)
+    assert base._current_memory() is None
+    monitor = SearchLimits(max_memory=0, memory_check_interval=1).start()
+    assert monitor.check(0) is None
+
+
+def test_memory_limit_is_enforced():
+    monitor = SearchLimits(max_memory=0, memory_check_interval=1).start()
+    assert monitor.check(0) == 'memory_limit'
+
+
+def test_iterative_deepening_searches_stop_at_their_limits():
+    problem = SlidingTilePuzzle('867254301')
+    heuristic_fn = make_heuristic_fn(problem, manhattan_distance)
+    result = IterativeDeepeningAStarSearch.search(problem, heuristic_fn, limits=SearchLimits(max_nodes=1000))
+    assert result.status == 'node_limit'
+    assert result.solution is None
+    assert 1000 <= result.nodes_generated < 1010
+    assert IterativeDeepeningSearch.search(problem, limits=SearchLimits(max_time=0.0)).status == 'time_limit'
@@ -0,0 +1,20 @@
+from cannibals.problems.sliding_tile.board import Board
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+from cannibals.search.base import SearchResult
+from cannibals.search.uninformed_search import BreadthFirstSearch, IterativeDeepeningSearch
+
+
+def test_iterative_deepening_returns_search_result():
+    problem = SlidingTilePuzzle(Board('123405786'))
+    result = IterativeDeepeningSearch.search(problem)
+    assert isinstance(result, SearchResult)
+    solution, nodes_generated = result
+    assert len(solution) == result.solution_cost == BreadthFirstSearch.search(problem).solution_cost
+    assert nodes_generated > 0
+    assert result.iterations == len(solution) + 1
+
+
+def test_iterative_deepening_unsolvable():
+    result = IterativeDeepeningSearch.search(SlidingTilePuzzle(Board('123456870')))
+    assert result.solution is None
+    assert result.iterations == 0
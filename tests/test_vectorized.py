@@ -0,0 +1,20 @@
+import pytest
+
+from cannibals.problems.sliding_tile.puzzle import SlidingTilePuzzle
+from cannibals.search.vectorized import VectorizedBreadthFirstSearch, breadth_first_depths
+
+pytest.importorskip('numpy')
+
+
+def test_solves_the_8_puzzle():
+    problem = SlidingTilePuzzle('635841027', '865317024')
+    result = VectorizedBreadthFirstSearch.search(problem)
+    assert result.solution_cost == 10
+
+
+def test_rejects_boards_wider_than_64_bits():
+    problem = SlidingTilePuzzle(list(range(1, 25)) + [0])
+    with pytest.raises(ValueError, match='64 bits'):
+        VectorizedBreadthFirstSearch.search(problem)
+    with pytest.raises(ValueError, match='64 bits'):
+        breadth_first_depths(problem)